@@ -5,306 +5,307 @@ FMA Kernel Benchmark: Ea vs hand-optimized C and competitors
 Measures performance of fused multiply-add operations:
 result[i] = a[i] * b[i] + c[i]
 
-Tests f32x4 (SSE) and f32x8 (AVX2) implementations.
-Competitors (Clang, ISPC, Rust std::simd) are included when available.
+Tests f32x4 (SSE), f32x8 (AVX2) and f32x16 (AVX-512) implementations, plus
+a BF16-in/BF16-out C kernel on CPUs with AVX512-BF16.
+Competitors (Clang, ISPC, Rust std::simd, Numba) are included when available,
+alongside a plain NumPy multiply+add row.
+
+Ratios and verdicts use the minimum time over the runs. OS noise (interrupts,
+preemption, frequency dips) only ever adds time, so the minimum is the best
+estimate of the kernel's own cost; the average is printed for reference.
 """
 
+import argparse
 import os
 import sys
-import subprocess
 import time
-import platform
 import numpy as np
-import ctypes
 from pathlib import Path
 
 # Make bench_common importable
 sys.path.insert(0, str(Path(__file__).parent.parent))
 import bench_common
+from fma_build import (
+    BENCH_DIR, BF16_PTR, FLOAT_PTR, FMA_ARGTYPES, build_all,
+    compile_ea_kernel_at_opts, time_blocked, time_calls,
+)
 
 # Configuration
-ARRAY_SIZE = 1_000_000  # 1M elements for meaningful timing
-NUM_RUNS = 100          # Average over many runs
+ARRAY_SIZE = 1_000_000  # 1M elements for meaningful timing (--array-size)
+TINY_SIZE = 2048        # --mode tiny: 4 arrays x 8 KiB, L1-resident
+L1_BLOCK = TINY_SIZE    # "(L1)" rows: ARRAY_SIZE of work in L1-sized calls
+L1_ROWS = ["GCC f32x8 (AVX2)", "GCC f32x4 (SSE)", "Ea f32x8", "Ea f32x4",
+           "Ea foreach+unroll"]
+NUM_RUNS = 100          # Average over many runs (--runs)
 WARMUP_RUNS = 10        # Warmup iterations
 
-BENCH_DIR = Path(__file__).parent
-FLOAT_PTR = ctypes.POINTER(ctypes.c_float)
-I32 = ctypes.c_int32
-FMA_ARGTYPES = [FLOAT_PTR, FLOAT_PTR, FLOAT_PTR, FLOAT_PTR, I32]
-
-
-def print_environment():
-    """Print CPU, compiler, and OS info for reproducibility"""
-    print("=== Environment ===")
-    print(f"OS: {platform.system()} {platform.release()}")
-    print(f"Arch: {platform.machine()}")
-
-    try:
-        with open("/proc/cpuinfo") as f:
-            for line in f:
-                if line.startswith("model name"):
-                    print(f"CPU: {line.split(':')[1].strip()}")
-                    break
-    except FileNotFoundError:
-        print(f"CPU: {platform.processor() or 'unknown'}")
-
-    try:
-        gcc = subprocess.run(["gcc", "--version"], capture_output=True, text=True)
-        print(f"GCC: {gcc.stdout.splitlines()[0]}")
-    except FileNotFoundError:
-        print("GCC: not found")
-
-    try:
-        llvm = subprocess.run(["llvm-config-14", "--version"],
-                              capture_output=True, text=True)
-        print(f"LLVM: {llvm.stdout.strip()}")
-    except FileNotFoundError:
-        print("LLVM: llvm-config-14 not found")
-
-    bench_common.print_competitor_versions()
-
-
-def compile_ea_kernel():
-    """Compile Ea kernel to shared library"""
-    print("Compiling Ea kernel...")
-
-    result = subprocess.run([
-        "cargo", "run", "--features=llvm", "--",
-        "kernel.ea", "--lib"
-    ], capture_output=True, text=True, cwd=BENCH_DIR)
-
-    if result.returncode != 0:
-        print(f"Ea compilation failed:")
-        print(f"stdout: {result.stdout}")
-        print(f"stderr: {result.stderr}")
-        sys.exit(1)
-
-    if not (BENCH_DIR / "kernel.so").exists():
-        print("Error: kernel.so not created")
-        sys.exit(1)
-
-    print("Ea kernel compiled successfully")
-
-    # Show instruction analysis
-    print("\n=== Kernel Analysis (ea inspect) ===")
-    inspect = subprocess.run([
-        "cargo", "run", "--features=llvm", "--",
-        "inspect", "kernel.ea"
-    ], capture_output=True, text=True, cwd=BENCH_DIR)
-    if inspect.returncode == 0:
-        print(inspect.stdout)
-    else:
-        print("  (ea inspect not available)")
-
 
-def compile_c_reference():
-    """Compile C reference with GCC and maximum optimization"""
-    print("Compiling C reference (GCC)...")
-
-    result = subprocess.run([
-        "gcc", "-O3", "-march=native", "-ffast-math",
-        "-shared", "-fPIC",
-        "reference.c", "-o", "reference.so"
-    ], capture_output=True, text=True, cwd=BENCH_DIR)
-
-    if result.returncode != 0:
-        print(f"C compilation failed:")
-        print(f"stdout: {result.stdout}")
-        print(f"stderr: {result.stderr}")
-        sys.exit(1)
-
-    print("C reference compiled successfully")
 
+def create_test_data():
+    """Create test arrays with meaningful data.
 
-def load_libraries():
-    """Load Ea and GCC libraries"""
-    ea_lib = ctypes.CDLL(str(BENCH_DIR / "kernel.so"))
-    c_lib = ctypes.CDLL(str(BENCH_DIR / "reference.so"))
+    Arrays are 2 MiB-aligned and huge-page backed (bench_common.aligned_array),
+    so vector loads never split lines and 4 MiB arrays need few TLB entries.
+    Values are generated in place as float32 (bench_common.uniform_array).
+    """
+    rng = np.random.default_rng(42)
+    return tuple(bench_common.uniform_array(rng, ARRAY_SIZE) for _ in range(3))
 
-    for name in ["fma_kernel_f32x4", "fma_kernel_f32x8",
-                  "fma_kernel_foreach", "fma_kernel_foreach_unroll"]:
-        fn = getattr(ea_lib, name)
-        fn.argtypes = FMA_ARGTYPES
-        fn.restype = None
 
-    c_lib.fma_kernel_f32x4_c.argtypes = FMA_ARGTYPES
-    c_lib.fma_kernel_f32x4_c.restype = None
+def benchmark_function(func, a, b, c, result, description,
+                       n=ARRAY_SIZE, cold=False, counters=None, elem_size=4):
+    """Benchmark a single FMA function on the first n elements.
 
-    c_lib.fma_kernel_f32x8_c.argtypes = FMA_ARGTYPES
-    c_lib.fma_kernel_f32x8_c.restype = None
+    cold=True flushes all buffers (n elements of elem_size bytes) from cache
+    before every timed call.
+    If a counters dict is given, hardware counts per element over the timed
+    runs are stored in it under description (None without perf access).
+    """
+    print(f"  Benchmarking {description}...")
 
-    c_lib.fma_kernel_scalar_c.argtypes = FMA_ARGTYPES
-    c_lib.fma_kernel_scalar_c.restype = None
+    # The timing loop runs in C (bench_harness.c): one ctypes call per
+    # measurement instead of one per kernel invocation.
+    time_calls(func, a, b, c, result, n, WARMUP_RUNS)
+    times, counts = bench_common.perf_counters(
+        lambda: time_calls(func, a, b, c, result, n, NUM_RUNS, cold=cold,
+                           elem_size=elem_size))
+    if counters is not None:
+        counters[description] = counts and {
+            event: count / (NUM_RUNS * n) for event, count in counts.items()}
 
-    return ea_lib, c_lib
+    avg_time = sum(times) / len(times)
+    min_time = min(times)
+    return avg_time, min_time
 
 
-def compile_ea_kernel_at_opt(opt_level):
-    """Compile Ea kernel at a specific optimization level, return .so path"""
-    so_name = f"kernel_O{opt_level}.so"
-    ea_root = BENCH_DIR.parent.parent
-    result = subprocess.run([
-        "cargo", "run", "--features=llvm", "--",
-        str(BENCH_DIR / "kernel.ea"), "--lib",
-        f"--opt-level={opt_level}", "-o", str(BENCH_DIR / so_name),
-    ], capture_output=True, text=True, cwd=ea_root)
-    if result.returncode != 0:
-        print(f"  Ea O{opt_level} compilation failed: {result.stderr[:200]}")
-        return None
-    return BENCH_DIR / so_name
+def print_throughput_header(title, width, dram_peak=None):
+    cols = (f"  {title:<{width}} | {'Avg (us)':>10} | {'Min (us)':>10} "
+            f"| {'GB/s':>8} | {'GFLOP/s':>8}")
+    rule = f"  {'-'*width}-+-{'-'*10}-+-{'-'*10}-+-{'-'*8}-+-{'-'*8}"
+    if dram_peak:
+        cols += f" | {'% peak':>7}"
+        rule += f"-+-{'-'*7}"
+    print(cols)
+    print(rule)
 
 
-def compile_and_load_competitors():
-    """Try to compile and load Clang, ISPC, and Rust competitors.
+def print_throughput_row(label, width, avg, mint, n, dram_peak=None,
+                         bytes_per_elem=16):
+    """One table row; rates use the min time. Returns the row's numbers.
 
-    Returns a list of (label, func) tuples for each available competitor.
+    Per element: 3 loads + 1 store (16 bytes for f32, 8 for bf16), one
+    FMA (2 FLOPs).
     """
-    competitors = []
-
-    # --- Clang versions ---
-    for ver in [14, 16, 17, 18]:
-        clang = bench_common.has_clang(ver)
-        if clang is None:
-            continue
-        so_name = f"reference_clang{ver}.so"
-        print(f"Compiling with {clang}...")
-        ok = bench_common.compile_with_clang(
-            clang, "reference.c", so_name, BENCH_DIR
-        )
-        if not ok:
-            continue
-        lib = bench_common.try_load(BENCH_DIR / so_name, f"Clang-{ver}")
-        if lib is None:
-            continue
-        # Set up signatures — same functions as GCC reference
-        for fname in ["fma_kernel_f32x4_c", "fma_kernel_f32x8_c",
-                       "fma_kernel_scalar_c"]:
-            fn = getattr(lib, fname)
-            fn.argtypes = FMA_ARGTYPES
-            fn.restype = None
-        competitors.append((f"Clang-{ver} f32x8", lib.fma_kernel_f32x8_c))
-        competitors.append((f"Clang-{ver} f32x4", lib.fma_kernel_f32x4_c))
-        break  # Use first available clang version
-
-    # --- ISPC ---
-    if bench_common.has_ispc():
-        print("Compiling ISPC kernel...")
-        ok = bench_common.compile_ispc(
-            "fma_kernel.ispc", "fma_kernel_ispc.so", BENCH_DIR
-        )
-        if ok:
-            lib = bench_common.try_load(
-                BENCH_DIR / "fma_kernel_ispc.so", "ISPC"
-            )
-            if lib:
-                lib.fma_kernel_ispc.argtypes = FMA_ARGTYPES
-                lib.fma_kernel_ispc.restype = None
-                competitors.append(("ISPC", lib.fma_kernel_ispc))
-
-    # --- Rust std::simd ---
-    if bench_common.has_rust_nightly():
-        crate_dir = BENCH_DIR.parent / "rust_competitors"
-        print("Building Rust competitors...")
-        so_path = bench_common.compile_rust_competitors(crate_dir)
-        if so_path:
-            lib = bench_common.try_load(so_path, "Rust std::simd")
-            if lib:
-                lib.fma_kernel_f32x4_rust.argtypes = FMA_ARGTYPES
-                lib.fma_kernel_f32x4_rust.restype = None
-                competitors.append(("Rust std::simd", lib.fma_kernel_f32x4_rust))
-
-    return competitors
-
-
-def create_test_data():
-    """Create test arrays with meaningful data"""
-    np.random.seed(42)
-    a = np.random.uniform(-1.0, 1.0, ARRAY_SIZE).astype(np.float32)
-    b = np.random.uniform(-1.0, 1.0, ARRAY_SIZE).astype(np.float32)
-    c = np.random.uniform(-1.0, 1.0, ARRAY_SIZE).astype(np.float32)
-    return a, b, c
+    gbs = n * bytes_per_elem / mint / 1e9
+    gflops = n * 2 / mint / 1e9
+    row = (f"  {label:<{width}} | {avg*1e6:>10.1f} | {mint*1e6:>10.1f} "
+           f"| {gbs:>8.2f} | {gflops:>8.2f}")
+    if dram_peak:
+        row += f" | {100 * gbs / dram_peak:>6.1f}%"
+    print(row)
+    return {"label": label, "n": n, "avg_ns": avg * 1e9, "min_ns": mint * 1e9,
+            "gbps": gbs, "gflops": gflops}
 
 
-def benchmark_function(func, a, b, c, result, description):
-    """Benchmark a single FMA function"""
-    print(f"  Benchmarking {description}...")
+def print_counter_table(counters, width):
+    """IPC, last-level misses per element and backend-stall share per kernel.
 
+    Counts cover the timed runs only (in cold mode, including the flushes).
+    """
+    rows = {label: c for label, c in counters.items() if c}
+    if not rows:
+        print("\n  Hardware counters unavailable "
+              "(no PMU, or check /proc/sys/kernel/perf_event_paranoid)")
+        return
+    print(f"\n  {'Counters':<{width}} | {'IPC':>6} | {'LLC-miss/elem':>13} "
+          f"| {'%stall-be':>9}")
+    print(f"  {'-'*width}-+-{'-'*6}-+-{'-'*13}-+-{'-'*9}")
+    for label, c in rows.items():
+        cycles = c["cycles"]
+        ipc = c.get("instructions", 0.0) / cycles if cycles else 0.0
+        miss = c.get("cache-misses")
+        stall = c.get("stalled-cycles-backend")
+        miss_col = f"{miss:>13.4f}" if miss is not None else f"{'n/a':>13}"
+        stall_col = (f"{100 * stall / cycles:>8.1f}%"
+                     if stall is not None and cycles else f"{'n/a':>9}")
+        print(f"  {label:<{width}} | {ipc:>6.2f} | {miss_col} | {stall_col}")
+
+
+MAX_ULP = 2
+
+
+def numpy_fma(a, b, c, out):
+    """a*b+c the NumPy way: two ufunc passes, no temporaries."""
+    np.multiply(a, b, out=out)
+    np.add(out, c, out=out)
+
+
+def benchmark_numpy(a, b, c, result, n):
+    """Time numpy_fma on the first n elements with perf_counter (warm only)."""
+    print("  Benchmarking NumPy multiply+add...")
+    args = (a[:n], b[:n], c[:n], result[:n])
     for _ in range(WARMUP_RUNS):
-        func(a, b, c, result, ARRAY_SIZE)
-
+        numpy_fma(*args)
     times = []
     for _ in range(NUM_RUNS):
-        start = time.perf_counter()
-        func(a, b, c, result, ARRAY_SIZE)
-        end = time.perf_counter()
-        times.append(end - start)
+        start = time.perf_counter_ns()
+        numpy_fma(*args)
+        times.append((time.perf_counter_ns() - start) * 1e-9)
+    return sum(times) / len(times), min(times)
 
-    avg_time = sum(times) / len(times)
-    min_time = min(times)
-    return avg_time, min_time
 
+def verify_correctness(kernels, a, b, c):
+    """Check every (label, func) kernel, and numpy_fma, over the full arrays
+    against a*b+c.
 
-def verify_correctness(ea_lib, c_lib, a, b, c):
-    """Verify that Ea and C produce identical results"""
+    The reference is computed in float64 (the product is exact there) and
+    rounded once to float32. Allows MAX_ULP, plus one rounding of a*b where a
+    kernel computes an unfused multiply-add (scalar C, the foreach variants,
+    NumPy): under cancellation that single product rounding spans many ULPs of the
+    small result.
+    """
     print("Verifying correctness...")
 
-    test_size = 100
-    a_test = a[:test_size]
-    b_test = b[:test_size]
-    c_test = c[:test_size]
+    n = len(a)
+    ptrs = [arr.ctypes.data_as(FLOAT_PTR) for arr in (a, b, c)]
+    expected = (a.astype(np.float64) * b + c).astype(np.float32)
+    product_slack = np.spacing(np.abs(a * b))
+
+    got = np.zeros(n, dtype=np.float32)
+    got_ptr = got.ctypes.data_as(FLOAT_PTR)
+    checks = [(label, lambda func=func: func(*ptrs, got_ptr, n))
+              for label, func in kernels]
+    checks.append(("NumPy multiply+add", lambda: numpy_fma(a, b, c, got)))
+    width = max(len(label) for label, _ in checks)
+    for label, run in checks:
+        got[:] = np.nan
+        run()
+        ulps = bench_common.ulp_diff(got, expected)
+        bad = (ulps > MAX_ULP) & ~(np.abs(got - expected) <= product_slack)
+        if bad.any():
+            idx = int(np.argmax(bad))
+            print(f"ERROR: {label} differs from a*b+c at {int(bad.sum())} "
+                  f"of {n} elements (max {int(ulps.max())} ULP)")
+            print(f"First difference at index: {idx}")
+            print(f"Kernel result: {got[idx]!r}  expected: {expected[idx]!r}")
+            sys.exit(1)
+        note = " (beyond that: one a*b rounding, unfused)" if ulps.max() > MAX_ULP else ""
+        print(f"  {label:<{width}}: max {int(ulps.max())} ULP over {n:,} elements{note}")
 
-    a_ptr = a_test.ctypes.data_as(FLOAT_PTR)
-    b_ptr = b_test.ctypes.data_as(FLOAT_PTR)
-    c_ptr = c_test.ctypes.data_as(FLOAT_PTR)
+    print("  Correctness verified")
 
-    ea_result = np.zeros(test_size, dtype=np.float32)
-    c_result = np.zeros(test_size, dtype=np.float32)
 
-    ea_result_ptr = ea_result.ctypes.data_as(FLOAT_PTR)
-    c_result_ptr = c_result.ctypes.data_as(FLOAT_PTR)
+def widen_bf16(h):
+    """bf16 bits (uint16) to float32, exactly: they are the top half."""
+    return (h.astype(np.uint32) << 16).view(np.float32)
 
-    ea_lib.fma_kernel_f32x4(a_ptr, b_ptr, c_ptr, ea_result_ptr, test_size)
-    c_lib.fma_kernel_f32x4_c(a_ptr, b_ptr, c_ptr, c_result_ptr, test_size)
 
-    if not np.allclose(ea_result, c_result, rtol=1e-5):
-        print(f"ERROR: f32x4 results don't match!")
-        idx = np.argmax(np.abs(ea_result - c_result))
+def verify_bf16(func, bf16):
+    """Check the bf16 kernel over the full arrays against a*b+c.
+
+    bf16 = [a, b, c, result] as uint16. The reference uses the same truncated
+    bf16 inputs, widened exactly, computed in float64 and rounded to float32.
+    The kernel rounds its float32 result to bf16, so one bf16 ULP (2**16
+    float32 ULPs) is allowed, plus one a*b rounding for the unfused tail.
+    """
+    n = len(bf16[0])
+    a, b, c = (widen_bf16(h) for h in bf16[:3])
+    expected = (a.astype(np.float64) * b + c).astype(np.float32)
+    tolerance = np.spacing(np.abs(expected)) * 2**16 + np.spacing(np.abs(a * b))
+
+    out = bf16[3]
+    out[:] = 0xFFFF  # NaN
+    func(*(h.ctypes.data_as(BF16_PTR) for h in bf16), n)
+    err = np.abs(widen_bf16(out) - expected)
+    bad = ~(err <= tolerance)
+    if bad.any():
+        idx = int(np.argmax(bad))
+        print(f"ERROR: GCC bf16 (AVX-512) differs from a*b+c at {int(bad.sum())} "
+              f"of {n} elements")
         print(f"First difference at index: {idx}")
-        print(f"Ea result: {ea_result[:10]}")
-        print(f"C result: {c_result[:10]}")
+        print(f"Kernel result: {widen_bf16(out[idx:idx + 1])[0]!r}  "
+              f"expected: {expected[idx]!r}")
         sys.exit(1)
-
-    print("  Correctness verified")
+    print(f"  GCC bf16 (AVX-512): within 1 bf16 ULP over {n:,} elements")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--pin", action="store_true",
+        help="pin to one CPU ($BENCH_CPU, else the allowed CPU with the "
+             "highest max frequency), raise scheduling priority and request "
+             "the performance governor",
+    )
+    parser.add_argument(
+        "--mode", choices=["hot", "cold", "tiny"], default="hot",
+        help="hot: 1M elements, cache-warm; cold: 1M elements, caches "
+             f"flushed before every call (DRAM-bound); tiny: {TINY_SIZE} "
+             "elements, L1-resident (codegen only)",
+    )
+    parser.add_argument(
+        "--dram-peak", type=float, metavar="GB/s",
+        help="theoretical DRAM bandwidth; adds an achieved-%% column",
+    )
+    parser.add_argument(
+        "--sweep-opt", action="store_true",
+        help="also rebuild the Ea kernel at -O0..-O3 and compare them",
+    )
+    parser.add_argument(
+        "--no-competitors", action="store_true",
+        help="skip building and timing Clang, ISPC, Rust and Numba",
+    )
+    parser.add_argument(
+        "--runs", type=int, default=NUM_RUNS,
+        help=f"timed runs per kernel (default {NUM_RUNS})",
+    )
+    parser.add_argument(
+        "--array-size", type=int, default=ARRAY_SIZE, metavar="N",
+        help=f"elements per array (default {ARRAY_SIZE:,})",
+    )
+    parser.add_argument(
+        "--json", metavar="PATH",
+        help="also write every row, counters and the environment to PATH",
+    )
+    return parser.parse_args()
 
 
 def main():
+    global ARRAY_SIZE, NUM_RUNS
+    args = parse_args()
+    ARRAY_SIZE, NUM_RUNS = args.array_size, args.runs
     os.chdir(BENCH_DIR)
 
     print("=== FMA Kernel Benchmark ===")
-    print_environment()
-    print(f"Array size: {ARRAY_SIZE:,} elements")
+    bench_common.print_environment()
+    n = min(TINY_SIZE, ARRAY_SIZE) if args.mode == "tiny" else ARRAY_SIZE
+    cold = args.mode == "cold"
+    print(f"Array size: {n:,} elements ({args.mode} cache)")
     print(f"Runs per test: {NUM_RUNS}")
+    if args.pin:
+        bench_common.pin_to_cpu()
     print()
 
-    # Compile core libraries
-    compile_ea_kernel()
-    compile_c_reference()
-    ea_lib, c_lib = load_libraries()
-
-    # Compile competitors (graceful — missing tools are skipped)
-    competitors = compile_and_load_competitors()
+    # Compile core libraries and competitors (graceful — missing tools are
+    # skipped); anything already built and current is reused
+    ea_lib, c_lib, competitors = build_all(
+        with_competitors=not args.no_competitors)
 
     # Create test data
     a, b, c = create_test_data()
     a_ptr = a.ctypes.data_as(FLOAT_PTR)
     b_ptr = b.ctypes.data_as(FLOAT_PTR)
     c_ptr = c.ctypes.data_as(FLOAT_PTR)
-    result = np.zeros(ARRAY_SIZE, dtype=np.float32)
+    result = bench_common.aligned_array(ARRAY_SIZE, np.float32)
     result_ptr = result.ctypes.data_as(FLOAT_PTR)
 
-    verify_correctness(ea_lib, c_lib, a, b, c)
-
-    print("\n=== Performance Results ===")
+    # BF16 copies of the inputs (truncated: the top half of each f32)
+    has_bf16 = bool(c_lib.cpu_has_avx512bf16())
+    if has_bf16:
+        bf16 = [bench_common.aligned_array(ARRAY_SIZE, np.uint16) for _ in range(4)]
+        for dst, src in zip(bf16, (a, b, c)):
+            dst[:] = src.view(np.uint32) >> 16
+        bf16_ptrs = [arr.ctypes.data_as(BF16_PTR) for arr in bf16]
 
     # Build the full benchmark list: core + foreach + competitors
     bench_list = [
@@ -316,36 +317,82 @@ def main():
         ("Ea foreach",       ea_lib.fma_kernel_foreach),
         ("Ea foreach+unroll", ea_lib.fma_kernel_foreach_unroll),
     ]
+    # Both f32x16 rows only on AVX-512 hosts: kernel.so is a native build, so
+    # elsewhere the Ea kernel is two f32x8 halves and would duplicate Ea f32x8
+    if c_lib.cpu_has_avx512f():
+        bench_list.insert(0, ("GCC f32x16 (AVX-512)", c_lib.fma_kernel_f32x16_c))
+        bench_list.insert(bench_list.index(("Ea f32x8", ea_lib.fma_kernel_f32x8)),
+                          ("Ea f32x16", ea_lib.fma_kernel_f32x16))
     bench_list.extend(competitors)
 
+    # Every timed kernel, competitors, bf16 and NumPy included, must be
+    # correct on the full arrays (tails and all) before its numbers mean
+    # anything
+    verify_correctness(bench_list, a, b, c)
+    if has_bf16:
+        verify_bf16(c_lib.fma_kernel_bf16_c, bf16)
+
+    print("\n=== Performance Results ===")
+
     results = {}
+    counters = {}
     for label, func in bench_list:
         avg, mint = benchmark_function(
-            func, a_ptr, b_ptr, c_ptr, result_ptr, label
+            func, a_ptr, b_ptr, c_ptr, result_ptr, label, n=n, cold=cold,
+            counters=counters
         )
         results[label] = (avg, mint)
 
-    # Find baseline: fastest C/SIMD implementation (GCC or Clang f32x8)
-    c_simd_labels = [l for l in results if "f32x8" in l or "f32x4" in l]
-    c_simd_labels = [l for l in c_simd_labels if not l.startswith("Ea")]
-    baseline_label = min(c_simd_labels, key=lambda l: results[l][0])
-    baseline_avg = results[baseline_label][0]
-
-    # Print unified table
-    print(f"\n  {'Implementation':<22} | {'Avg (us)':>10} | {'Min (us)':>10} "
-          f"| {'vs Best C':>10}")
-    print(f"  {'-'*22}-+-{'-'*10}-+-{'-'*10}-+-{'-'*10}")
-
+    # BF16 in/out, f32 math: 8 bytes per element instead of 16
+    if has_bf16:
+        avg, mint = benchmark_function(
+            c_lib.fma_kernel_bf16_c, *bf16_ptrs, "GCC bf16 (AVX-512)",
+            n=n, cold=cold, counters=counters, elem_size=bf16[0].itemsize
+        )
+        results["GCC bf16 (AVX-512)"] = (avg, mint)
+
+    # What the same arrays cost without any compiled kernel; timed from
+    # Python, so there is no cache-flushing variant
+    if not cold:
+        results["NumPy multiply+add"] = benchmark_numpy(a, b, c, result, n)
+
+    # Same work, but as ARRAY_SIZE / L1_BLOCK calls on one L1-resident block:
+    # compute-bound, so SIMD width and codegen differences show
+    funcs = dict(bench_list)
+    l1_results = {}
+    l1_n = ARRAY_SIZE // L1_BLOCK * L1_BLOCK
+    for label in L1_ROWS if l1_n else []:
+        print(f"  Benchmarking {label} (L1-resident)...")
+        times = time_blocked(funcs[label], a_ptr, b_ptr, c_ptr, result_ptr,
+                             ARRAY_SIZE, L1_BLOCK, NUM_RUNS, warmup=WARMUP_RUNS)
+        if times is not None:
+            l1_results[f"{label} (L1)"] = (sum(times) / len(times), min(times))
+
+    # Print unified table: throughput at the min time, the kernel's best run
+    print()
+    print_throughput_header("Implementation", 22, args.dram_peak)
+    rows = []
     for label, _ in bench_list:
         avg, mint = results[label]
-        ratio = avg / baseline_avg
-        print(f"  {label:<22} | {avg*1e6:>10.1f} | {mint*1e6:>10.1f} "
-              f"| {ratio:>9.3f}x")
+        rows.append(print_throughput_row(label, 22, avg, mint, n, args.dram_peak))
+    if has_bf16:
+        avg, mint = results["GCC bf16 (AVX-512)"]
+        rows.append(print_throughput_row("GCC bf16 (AVX-512)", 22, avg, mint, n,
+                                         args.dram_peak, bytes_per_elem=8))
+    if "NumPy multiply+add" in results:
+        avg, mint = results["NumPy multiply+add"]
+        rows.append(print_throughput_row("NumPy multiply+add", 22, avg, mint, n,
+                                         args.dram_peak))
+    for label, (avg, mint) in l1_results.items():
+        rows.append(print_throughput_row(label, 22, avg, mint, l1_n))
+    for row in rows:
+        row["counters"] = counters.get(row["label"])
+    print_counter_table(counters, 22)
 
     # Key ratios
-    ea4_avg = results["Ea f32x4"][0]
-    gcc4_avg = results["GCC f32x4 (SSE)"][0]
-    ea4_vs_gcc4 = ea4_avg / gcc4_avg
+    ea4_min = results["Ea f32x4"][1]
+    gcc4_min = results["GCC f32x4 (SSE)"][1]
+    ea4_vs_gcc4 = ea4_min / gcc4_min
     print(f"\nKey Result: Ea f32x4 vs GCC f32x4 = {ea4_vs_gcc4:.3f}x")
 
     if ea4_vs_gcc4 <= 1.1:
@@ -353,29 +400,42 @@ def main():
     else:
         print("  More than 10% slower than C")
 
-    scalar_avg = results["GCC scalar"][0]
-    speedup = scalar_avg / gcc4_avg
+    scalar_min = results["GCC scalar"][1]
+    speedup = scalar_min / gcc4_min
     print(f"SIMD speedup vs scalar = {speedup:.1f}x")
 
-    # --- Opt-level comparison ---
-    print("\n=== Optimization Level Comparison (Ea foreach) ===")
-    print(f"  {'Opt Level':<12} | {'Avg (us)':>10} | {'Min (us)':>10} "
-          f"| {'vs Best C':>10}")
-    print(f"  {'-'*12}-+-{'-'*10}-+-{'-'*10}-+-{'-'*10}")
-    for opt in [0, 1, 2, 3]:
-        so_path = compile_ea_kernel_at_opt(opt)
-        if so_path is None:
-            continue
-        opt_lib = ctypes.CDLL(str(so_path))
-        opt_lib.fma_kernel_foreach.argtypes = FMA_ARGTYPES
-        opt_lib.fma_kernel_foreach.restype = None
-        avg, mint = benchmark_function(
-            opt_lib.fma_kernel_foreach, a_ptr, b_ptr, c_ptr, result_ptr,
-            f"Ea foreach O{opt}"
-        )
-        ratio = avg / baseline_avg
-        print(f"  O{opt:<11} | {avg*1e6:>10.1f} | {mint*1e6:>10.1f} "
-              f"| {ratio:>9.3f}x")
+    # --- Opt-level comparison: four extra Ea builds, so opt-in ---
+    opt_rows = []
+    if args.sweep_opt:
+        print("\n=== Optimization Level Comparison (Ea foreach) ===")
+        # Compile all four concurrently, then time them one at a time
+        opt_paths = compile_ea_kernel_at_opts()
+        print_throughput_header("Opt Level", 12, args.dram_peak)
+        for opt, so_path in opt_paths.items():
+            if so_path is None:
+                continue
+            opt_lib = bench_common.load_library(so_path)
+            opt_lib.fma_kernel_foreach.argtypes = FMA_ARGTYPES
+            opt_lib.fma_kernel_foreach.restype = None
+            avg, mint = benchmark_function(
+                opt_lib.fma_kernel_foreach, a_ptr, b_ptr, c_ptr, result_ptr,
+                f"Ea foreach O{opt}", n=n, cold=cold
+            )
+            row = print_throughput_row(f"O{opt}", 12, avg, mint, n, args.dram_peak)
+            opt_rows.append({**row, "label": "Ea foreach", "opt_level": opt})
+
+    if args.json:
+        bench_common.write_json_report(args.json, {
+            "benchmark": "fma_kernel",
+            "mode": args.mode,
+            "array_size": ARRAY_SIZE,
+            "runs": NUM_RUNS,
+            "dram_peak_gbps": args.dram_peak,
+            "kernels": rows,
+            "competitors": [label for label, _ in competitors],
+            "opt_sweep": opt_rows,
+            "ea_f32x4_vs_gcc_f32x4": ea4_vs_gcc4,
+        })
 
 
 if __name__ == "__main__":
@@ -0,0 +1,112 @@
+// Timing harness: runs an FMA kernel `runs` times and records each call's
+// duration, so Python crosses the ctypes boundary once per measurement
+// instead of once per call. Buffers are untyped so the bf16 kernel, which
+// takes uint16 arrays, can share it; fn receives them unchanged.
+#define _GNU_SOURCE
+#include <stddef.h>
+#include <stdint.h>
+#include <time.h>
+#if defined(__x86_64__) || defined(__i386__)
+#include <immintrin.h>
+#endif
+
+typedef void (*fma_fn)(const float*, const float*, const float*, float*, int32_t);
+
+static uint64_t now_ns(void) {
+    struct timespec ts;
+#ifdef CLOCK_MONOTONIC_RAW
+    clock_gettime(CLOCK_MONOTONIC_RAW, &ts);
+#else
+    clock_gettime(CLOCK_MONOTONIC, &ts);
+#endif
+    return (uint64_t)ts.tv_sec * 1000000000ull + (uint64_t)ts.tv_nsec;
+}
+
+void run_times(
+    fma_fn fn,
+    const void* a,
+    const void* b,
+    const void* c,
+    void* result,
+    int32_t len,
+    int32_t runs,
+    uint64_t* out_ns
+) {
+    for (int32_t r = 0; r < runs; r++) {
+        uint64_t t0 = now_ns();
+        fn(a, b, c, result, len);
+        out_ns[r] = now_ns() - t0;
+    }
+}
+
+// Evict [p, p + bytes) from every cache level.
+void flush_cache(const void* p, size_t bytes) {
+    const char* base = (const char*)p;
+    for (size_t off = 0; off < bytes; off += 64) {
+#if defined(__CLFLUSHOPT__)
+        _mm_clflushopt((void*)(base + off));
+#elif defined(__x86_64__) || defined(__i386__)
+        _mm_clflush(base + off);
+#elif defined(__aarch64__)
+        __asm__ volatile("dc civac, %0" :: "r"(base + off) : "memory");
+#else
+        (void)base;
+#endif
+    }
+#if defined(__x86_64__) || defined(__i386__)
+    _mm_mfence();
+#elif defined(__aarch64__)
+    __asm__ volatile("dsb ish" ::: "memory");
+#endif
+}
+
+// Like run_times, but every call starts with a, b, c and result flushed to
+// DRAM. The flush happens outside the timed window. elem_size is the size
+// of one element in bytes (4 for f32, 2 for bf16), so exactly the len
+// elements of each buffer are flushed.
+void run_times_cold(
+    fma_fn fn,
+    const void* a,
+    const void* b,
+    const void* c,
+    void* result,
+    int32_t len,
+    int32_t elem_size,
+    int32_t runs,
+    uint64_t* out_ns
+) {
+    size_t bytes = (size_t)len * (size_t)elem_size;
+    for (int32_t r = 0; r < runs; r++) {
+        flush_cache(a, bytes);
+        flush_cache(b, bytes);
+        flush_cache(c, bytes);
+        flush_cache(result, bytes);
+        uint64_t t0 = now_ns();
+        fn(a, b, c, result, len);
+        out_ns[r] = now_ns() - t0;
+    }
+}
+
+// L1-resident timing: each sample makes len / block calls on the first
+// `block` elements, so the work matches a full-length call but the data
+// never leaves L1 and compute, not bandwidth, sets the pace.
+void run_times_blocked(
+    fma_fn fn,
+    const void* a,
+    const void* b,
+    const void* c,
+    void* result,
+    int32_t len,
+    int32_t block,
+    int32_t runs,
+    uint64_t* out_ns
+) {
+    int32_t reps = len / block;
+    for (int32_t r = 0; r < runs; r++) {
+        uint64_t t0 = now_ns();
+        for (int32_t k = 0; k < reps; k++) {
+            fn(a, b, c, result, block);
+        }
+        out_ns[r] = now_ns() - t0;
+    }
+}
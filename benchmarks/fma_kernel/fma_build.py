@@ -0,0 +1,394 @@
+"""
+Build and load the FMA benchmark libraries.
+
+Shared by bench.py and quick_bench.py so a session compiles kernel.so,
+reference.so and the competitor libraries once; later runs reuse them
+while their recorded build digest still matches (see
+bench_common.build_is_current).
+"""
+
+import ctypes
+import functools
+from concurrent.futures import ThreadPoolExecutor
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+# Make bench_common importable
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import bench_common
+
+BENCH_DIR = Path(__file__).parent
+FLOAT_PTR = ctypes.POINTER(ctypes.c_float)
+BF16_PTR = ctypes.POINTER(ctypes.c_uint16)
+I32 = ctypes.c_int32
+FMA_ARGTYPES = [FLOAT_PTR, FLOAT_PTR, FLOAT_PTR, FLOAT_PTR, I32]
+BF16_ARGTYPES = [BF16_PTR, BF16_PTR, BF16_PTR, BF16_PTR, I32]
+FMA_FUNC = ctypes.CFUNCTYPE(None, *FMA_ARGTYPES)
+
+
+def compile_ea_kernel():
+    """Compile Ea kernel to shared library (skipped if kernel.so is current)"""
+    so_path = BENCH_DIR / "kernel.so"
+    inspect_path = BENCH_DIR / "kernel.inspect.txt"
+    if bench_common.build_is_current(
+            so_path, bench_common.ea_kernel_digest(BENCH_DIR / "kernel.ea")):
+        print("Ea kernel up to date (kernel.so)")
+        if inspect_path.exists():
+            print("\n=== Kernel Analysis (ea inspect) ===")
+            print(inspect_path.read_text())
+        return
+
+    # Build the compiler once (if stale) and run it directly
+    compiler = bench_common.build_ea_compiler()
+    if compiler is None:
+        sys.exit(1)
+
+    print("Compiling Ea kernel...")
+
+    result = subprocess.run([
+        str(compiler), "kernel.ea", "--lib"
+    ], capture_output=True, cwd=BENCH_DIR)
+
+    if result.returncode != 0:
+        print(f"Ea compilation failed:")
+        print(f"stdout: {bench_common.decode(result.stdout)}")
+        print(f"stderr: {bench_common.decode(result.stderr)}")
+        sys.exit(1)
+
+    if not so_path.exists():
+        print("Error: kernel.so not created")
+        sys.exit(1)
+
+    # The compiler may have just been rebuilt
+    bench_common.record_build(
+        so_path, bench_common.ea_kernel_digest(BENCH_DIR / "kernel.ea"))
+    print("Ea kernel compiled successfully")
+
+    # Show instruction analysis
+    print("\n=== Kernel Analysis (ea inspect) ===")
+    inspect = subprocess.run([
+        str(compiler), "inspect", "kernel.ea"
+    ], capture_output=True, cwd=BENCH_DIR)
+    if inspect.returncode == 0:
+        text = bench_common.decode(inspect.stdout)
+        print(text)
+        inspect_path.write_text(text)
+    else:
+        print("  (ea inspect not available)")
+
+
+def compile_c_reference():
+    """Compile C reference with GCC and maximum optimization"""
+    cmd = [
+        "gcc", "-O3", "-march=native", "-ffast-math",
+        "-shared", "-fPIC", "-pipe",
+        "reference.c", "-o", "reference.so",
+    ]
+    so_path = BENCH_DIR / "reference.so"
+    digest = bench_common.build_digest(
+        BENCH_DIR / "reference.c",
+        extra=" ".join(cmd) + "\n" + bench_common.tool_version("gcc"),
+    )
+    if bench_common.build_is_current(so_path, digest):
+        print("C reference up to date (reference.so)")
+        return
+
+    print("Compiling C reference (GCC)...")
+
+    result = subprocess.run(cmd, capture_output=True, cwd=BENCH_DIR,
+                            env=bench_common.compiler_env())
+
+    if result.returncode != 0:
+        print(f"C compilation failed:")
+        print(f"stdout: {bench_common.decode(result.stdout)}")
+        print(f"stderr: {bench_common.decode(result.stderr)}")
+        sys.exit(1)
+
+    bench_common.record_build(so_path, digest)
+    print("C reference compiled successfully")
+
+
+def load_libraries():
+    """Load Ea and GCC libraries"""
+    ea_lib = bench_common.load_library(BENCH_DIR / "kernel.so")
+    c_lib = bench_common.load_library(BENCH_DIR / "reference.so")
+
+    for name in ["fma_kernel_f32x4", "fma_kernel_f32x8", "fma_kernel_f32x16",
+                  "fma_kernel_foreach", "fma_kernel_foreach_unroll"]:
+        fn = getattr(ea_lib, name)
+        fn.argtypes = FMA_ARGTYPES
+        fn.restype = None
+
+    c_lib.fma_kernel_f32x4_c.argtypes = FMA_ARGTYPES
+    c_lib.fma_kernel_f32x4_c.restype = None
+
+    c_lib.fma_kernel_f32x8_c.argtypes = FMA_ARGTYPES
+    c_lib.fma_kernel_f32x8_c.restype = None
+
+    c_lib.fma_kernel_scalar_c.argtypes = FMA_ARGTYPES
+    c_lib.fma_kernel_scalar_c.restype = None
+
+    c_lib.fma_kernel_f32x16_c.argtypes = FMA_ARGTYPES
+    c_lib.fma_kernel_f32x16_c.restype = None
+
+    # uint16 bf16 buffers; the timing harness takes untyped pointers
+    c_lib.fma_kernel_bf16_c.argtypes = BF16_ARGTYPES
+    c_lib.fma_kernel_bf16_c.restype = None
+
+    for name in ["cpu_has_avx512f", "cpu_has_avx512bf16"]:
+        fn = getattr(c_lib, name)
+        fn.argtypes = []
+        fn.restype = ctypes.c_int
+
+    return ea_lib, c_lib
+
+
+def _opt_digest(opt_level):
+    return bench_common.ea_kernel_digest(BENCH_DIR / "kernel.ea",
+                                         f"--opt-level={opt_level}")
+
+
+@functools.lru_cache(maxsize=None)
+def compile_ea_kernel_at_opt(opt_level):
+    """Compile Ea kernel at a specific optimization level, return .so path"""
+    so_name = f"kernel_O{opt_level}.so"
+    if bench_common.build_is_current(BENCH_DIR / so_name, _opt_digest(opt_level)):
+        return BENCH_DIR / so_name
+    compiler = bench_common.build_ea_compiler()
+    if compiler is None:
+        return None
+    # Run the built binary directly: concurrent `cargo run`s would serialize
+    # on Cargo's build-directory lock
+    result = subprocess.run([
+        str(compiler),
+        str(BENCH_DIR / "kernel.ea"), "--lib",
+        f"--opt-level={opt_level}", "-o", str(BENCH_DIR / so_name),
+    ], capture_output=True, cwd=BENCH_DIR)
+    if result.returncode != 0:
+        print(f"  Ea O{opt_level} compilation failed: "
+              f"{bench_common.decode(result.stderr[:200])}")
+        return None
+    bench_common.record_build(BENCH_DIR / so_name, _opt_digest(opt_level))
+    return BENCH_DIR / so_name
+
+
+def compile_ea_kernel_at_opts(opt_levels=(0, 1, 2, 3)):
+    """Compile the per-opt-level kernels concurrently: {opt: path or None}.
+
+    The compiler is built once first; each level then writes its own
+    kernel_O{opt}.so, so the LLVM runs are independent.
+    """
+    stale = [opt for opt in opt_levels if not bench_common.build_is_current(
+        BENCH_DIR / f"kernel_O{opt}.so", _opt_digest(opt))]
+    if stale:
+        print(f"Compiling Ea kernel at {', '.join(f'O{o}' for o in stale)}...")
+        if bench_common.build_ea_compiler() is None:
+            return {opt: None for opt in opt_levels}
+    with ThreadPoolExecutor(max_workers=len(opt_levels)) as pool:
+        paths = list(pool.map(compile_ea_kernel_at_opt, opt_levels))
+    return dict(zip(opt_levels, paths))
+
+
+def _build_clang():
+    """First installed Clang of 14/16/17/18: [(label, func), ...] or []."""
+    for ver in [14, 16, 17, 18]:
+        clang = bench_common.has_clang(ver)
+        if clang is None:
+            continue
+        so_name = f"reference_clang{ver}.so"
+        if not bench_common.clang_is_current(clang, "reference.c", so_name,
+                                             BENCH_DIR):
+            print(f"Compiling with {clang}...")
+            ok = bench_common.compile_with_clang(
+                clang, "reference.c", so_name, BENCH_DIR
+            )
+            if not ok:
+                continue
+        lib = bench_common.try_load(BENCH_DIR / so_name, f"Clang-{ver}")
+        if lib is None:
+            continue
+        # Set up signatures — same functions as GCC reference
+        for fname in ["fma_kernel_f32x4_c", "fma_kernel_f32x8_c",
+                       "fma_kernel_scalar_c"]:
+            fn = getattr(lib, fname)
+            fn.argtypes = FMA_ARGTYPES
+            fn.restype = None
+        return [(f"Clang-{ver} f32x8", lib.fma_kernel_f32x8_c),
+                (f"Clang-{ver} f32x4", lib.fma_kernel_f32x4_c)]
+    return []
+
+
+def _build_ispc():
+    if not bench_common.has_ispc():
+        return []
+    ok = True
+    if not bench_common.ispc_is_current("fma_kernel.ispc", "fma_kernel_ispc.so",
+                                        BENCH_DIR):
+        print("Compiling ISPC kernel...")
+        ok = bench_common.compile_ispc(
+            "fma_kernel.ispc", "fma_kernel_ispc.so", BENCH_DIR
+        )
+    if not ok:
+        return []
+    lib = bench_common.try_load(BENCH_DIR / "fma_kernel_ispc.so", "ISPC")
+    if lib is None:
+        return []
+    lib.fma_kernel_ispc.argtypes = FMA_ARGTYPES
+    lib.fma_kernel_ispc.restype = None
+    return [("ISPC", lib.fma_kernel_ispc)]
+
+
+def _build_rust():
+    if not bench_common.has_rust_nightly():
+        return []
+    crate_dir = BENCH_DIR.parent / "rust_competitors"
+    print("Building Rust competitors...")
+    so_path = bench_common.compile_rust_competitors(crate_dir)
+    if not so_path:
+        return []
+    lib = bench_common.try_load(so_path, "Rust std::simd")
+    if lib is None:
+        return []
+    lib.fma_kernel_f32x4_rust.argtypes = FMA_ARGTYPES
+    lib.fma_kernel_f32x4_rust.restype = None
+    return [("Rust std::simd", lib.fma_kernel_f32x4_rust)]
+
+
+_numba_kernels = []  # compiled cfuncs must outlive their function pointers
+
+
+def _build_numba():
+    """Numba @cfunc scalar loop: what a Python user gets from `pip install
+    numba`. A cfunc is a real C function pointer, so it runs under the same
+    C timing harness as the compiled kernels."""
+    try:
+        import numba
+    except ImportError:
+        return []
+    print("Compiling Numba kernel...")
+
+    @numba.cfunc("void(CPointer(float32), CPointer(float32), CPointer(float32),"
+                 " CPointer(float32), int32)", fastmath=True)
+    def fma_kernel_numba(a, b, c, result, n):
+        for i in range(n):
+            result[i] = a[i] * b[i] + c[i]
+
+    _numba_kernels.append(fma_kernel_numba)
+    return [("Numba (scalar loop)", FMA_FUNC(fma_kernel_numba.address))]
+
+
+def compile_and_load_competitors():
+    """Try to compile and load Clang, ISPC, Rust and Numba competitors.
+
+    The toolchains build concurrently (each is a subprocess or releases the
+    GIL in LLVM, so threads suffice); results keep the fixed Clang, ISPC,
+    Rust, Numba order. Returns a list of (label, func) tuples for each
+    available competitor.
+    """
+    builders = [_build_clang, _build_ispc, _build_rust, _build_numba]
+    with ThreadPoolExecutor(max_workers=len(builders)) as pool:
+        futures = [pool.submit(build) for build in builders]
+    competitors = []
+    for fut in futures:
+        competitors.extend(fut.result())
+    return competitors
+
+
+@functools.lru_cache(maxsize=None)
+def load_harness():
+    """Compile (if stale) and load bench_harness.c; None if gcc fails."""
+    so_path = BENCH_DIR / "bench_harness.so"
+    cmd = [
+        "gcc", "-O2", "-march=native", "-shared", "-fPIC", "-pipe",
+        "bench_harness.c", "-o", "bench_harness.so",
+    ]
+    digest = bench_common.build_digest(
+        BENCH_DIR / "bench_harness.c",
+        extra=" ".join(cmd) + "\n" + bench_common.tool_version("gcc"),
+    )
+    if not bench_common.build_is_current(so_path, digest):
+        result = subprocess.run(cmd, capture_output=True, cwd=BENCH_DIR,
+                                env=bench_common.compiler_env())
+        if result.returncode != 0:
+            stderr = bench_common.decode(result.stderr).strip()
+            print(f"  Timing harness compilation failed: {stderr}")
+            return None
+        bench_common.record_build(so_path, digest)
+    lib = bench_common.try_load(so_path, "timing harness")
+    if lib is None:
+        return None
+    # Buffers are untyped (void*): f32 and bf16 kernels share the harness
+    buffers = [ctypes.c_void_p] * 4
+    out = ctypes.POINTER(ctypes.c_uint64)
+    lib.run_times.argtypes = [ctypes.c_void_p] + buffers + [I32, I32, out]
+    lib.run_times.restype = None
+    lib.run_times_cold.argtypes = [ctypes.c_void_p] + buffers + [I32, I32, I32, out]
+    lib.run_times_cold.restype = None
+    lib.run_times_blocked.argtypes = [ctypes.c_void_p] + buffers + [I32, I32, I32, out]
+    lib.run_times_blocked.restype = None
+    return lib
+
+
+def time_calls(func, a, b, c, result, n, runs, warmup=0, cold=False,
+               elem_size=4):
+    """Per-call times in seconds for `runs` calls of func, timed in C.
+
+    With cold=True every timed call starts with all four buffers (n
+    elements of elem_size bytes each) flushed from cache. Falls back to a
+    (warm-only) perf_counter loop if the harness is unavailable.
+    """
+    harness = load_harness()
+    if harness is None:
+        # Everything the loop touches is a local, and n is converted to
+        # c_int32 once rather than by ctypes on every call.
+        _fn = func
+        _n = I32(n)
+        _now = time.perf_counter_ns
+        for _ in range(warmup):
+            _fn(a, b, c, result, _n)
+        times = []
+        _app = times.append
+        for _ in range(runs):
+            start = _now()
+            _fn(a, b, c, result, _n)
+            _app(_now() - start)
+        return [t * 1e-9 for t in times]
+    n = I32(n)
+    fn_ptr = ctypes.cast(func, ctypes.c_void_p)
+    out_ns = (ctypes.c_uint64 * max(runs, warmup, 1))()
+    if warmup:
+        harness.run_times(fn_ptr, a, b, c, result, n, warmup, out_ns)
+    if cold:
+        harness.run_times_cold(fn_ptr, a, b, c, result, n, elem_size, runs, out_ns)
+    else:
+        harness.run_times(fn_ptr, a, b, c, result, n, runs, out_ns)
+    return [t * 1e-9 for t in out_ns[:runs]]
+
+
+def time_blocked(func, a, b, c, result, n, block, runs, warmup=0):
+    """Per-sample times in seconds, each sample n // block calls on the
+    first `block` elements (L1-resident). None without the C harness."""
+    harness = load_harness()
+    if harness is None:
+        return None
+    fn_ptr = ctypes.cast(func, ctypes.c_void_p)
+    out_ns = (ctypes.c_uint64 * max(runs, warmup, 1))()
+    if warmup:
+        harness.run_times_blocked(fn_ptr, a, b, c, result, n, block, warmup, out_ns)
+    harness.run_times_blocked(fn_ptr, a, b, c, result, n, block, runs, out_ns)
+    return [t * 1e-9 for t in out_ns[:runs]]
+
+
+@functools.lru_cache(maxsize=None)
+def build_all(with_competitors=True):
+    """Compile (if stale) and load everything: (ea_lib, c_lib, competitors).
+
+    Cached per process, so repeated calls never rebuild or reload.
+    """
+    compile_ea_kernel()
+    compile_c_reference()
+    ea_lib, c_lib = load_libraries()
+    competitors = compile_and_load_competitors() if with_competitors else []
+    return ea_lib, c_lib, competitors
@@ -69,4 +69,78 @@ void fma_kernel_scalar_c(
     for (int32_t i = 0; i < len; i++) {
         result[i] = a[i] * b[i] + c[i];
     }
-}
\ No newline at end of file
+}
+
+// FMA with AVX-512 f32x16 (512-bit vectors). Compiled for AVX-512 whatever
+// -march says; only call it when cpu_has_avx512f() is true.
+__attribute__((target("avx512f")))
+void fma_kernel_f32x16_c(
+    const float* a,
+    const float* b,
+    const float* c,
+    float* result,
+    int32_t len
+) {
+    int32_t i = 0;
+
+    for (; i + 16 <= len; i += 16) {
+        __m512 va = _mm512_loadu_ps(&a[i]);
+        __m512 vb = _mm512_loadu_ps(&b[i]);
+        __m512 vc = _mm512_loadu_ps(&c[i]);
+        _mm512_storeu_ps(&result[i], _mm512_fmadd_ps(va, vb, vc));
+    }
+
+    for (; i < len; i++) {
+        result[i] = a[i] * b[i] + c[i];
+    }
+}
+
+// bf16 -> f32 is exact: the bf16 bits are the top half of the f32.
+static inline float bf16_to_f32(uint16_t h) {
+    union { uint32_t u; float f; } v = { (uint32_t)h << 16 };
+    return v.f;
+}
+
+// f32 -> bf16, round to nearest even (NaN handling omitted).
+static inline uint16_t f32_to_bf16(float f) {
+    union { float f; uint32_t u; } v = { f };
+    v.u += 0x7FFF + ((v.u >> 16) & 1);
+    return (uint16_t)(v.u >> 16);
+}
+
+// BF16 in, BF16 out, f32 FMA in between: half the bytes per element of the
+// f32 kernels. Only call it when cpu_has_avx512bf16() is true.
+__attribute__((target("avx512f,avx512bf16")))
+void fma_kernel_bf16_c(
+    const uint16_t* a,
+    const uint16_t* b,
+    const uint16_t* c,
+    uint16_t* result,
+    int32_t len
+) {
+    int32_t i = 0;
+
+    for (; i + 16 <= len; i += 16) {
+        __m512 va = _mm512_castsi512_ps(_mm512_slli_epi32(
+            _mm512_cvtepu16_epi32(_mm256_loadu_si256((const __m256i*)&a[i])), 16));
+        __m512 vb = _mm512_castsi512_ps(_mm512_slli_epi32(
+            _mm512_cvtepu16_epi32(_mm256_loadu_si256((const __m256i*)&b[i])), 16));
+        __m512 vc = _mm512_castsi512_ps(_mm512_slli_epi32(
+            _mm512_cvtepu16_epi32(_mm256_loadu_si256((const __m256i*)&c[i])), 16));
+        __m256bh vr = _mm512_cvtneps_pbh(_mm512_fmadd_ps(va, vb, vc));
+        _mm256_storeu_si256((__m256i*)&result[i], (__m256i)vr);
+    }
+
+    for (; i < len; i++) {
+        result[i] = f32_to_bf16(bf16_to_f32(a[i]) * bf16_to_f32(b[i]) + bf16_to_f32(c[i]));
+    }
+}
+
+// Runtime CPU checks for the kernels above.
+int cpu_has_avx512f(void) {
+    return __builtin_cpu_supports("avx512f") != 0;
+}
+
+int cpu_has_avx512bf16(void) {
+    return __builtin_cpu_supports("avx512f") && __builtin_cpu_supports("avx512bf16");
+}
@@ -6,13 +6,15 @@ Measures performance of reduction operations (sum, max, min) across arrays.
 Competitors (Clang, ISPC, Rust std::simd) are included when available.
 """
 
+import argparse
+import json
 import os
 import sys
 import subprocess
 import time
-import platform
 import numpy as np
 import ctypes
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Make bench_common importable
@@ -21,102 +23,103 @@ import bench_common
 
 # Configuration
 ARRAY_SIZE = 1_000_000
-NUM_RUNS = 200
+# Samples are taken SAMPLE_CHUNK at a time until the 5th percentile is
+# within CONVERGENCE of the minimum (checked from MIN_RUNS on, so p5 is not
+# just the second-smallest sample), or MAX_RUNS have been collected.
+SAMPLE_CHUNK = 20
+MIN_RUNS = 40
+MAX_RUNS = 1000
+CONVERGENCE = 0.01
 WARMUP_RUNS = 20
+BATCH = 16  # calls per sample in the Python fallback, amortizing the clock
+SEED = 42
+EVICT_BYTES = 64 << 20  # streamed between variants; larger than any LLC
 
 BENCH_DIR = Path(__file__).parent
-FLOAT_PTR = ctypes.POINTER(ctypes.c_float)
+VERIFY_CACHE = BENCH_DIR / ".verify_cache.json"
 I32 = ctypes.c_int32
 F32 = ctypes.c_float
-REDUCE_ARGTYPES = [FLOAT_PTR, I32]
-
-
-def print_environment():
-    """Print CPU, compiler, and OS info for reproducibility"""
-    print("=== Environment ===")
-    print(f"OS: {platform.system()} {platform.release()}")
-    print(f"Arch: {platform.machine()}")
-
-    try:
-        with open("/proc/cpuinfo") as f:
-            for line in f:
-                if line.startswith("model name"):
-                    print(f"CPU: {line.split(':')[1].strip()}")
-                    break
-    except FileNotFoundError:
-        print(f"CPU: {platform.processor() or 'unknown'}")
-
-    try:
-        gcc = subprocess.run(["gcc", "--version"], capture_output=True, text=True)
-        print(f"GCC: {gcc.stdout.splitlines()[0]}")
-    except FileNotFoundError:
-        print("GCC: not found")
-
-    try:
-        llvm = subprocess.run(["llvm-config-14", "--version"],
-                              capture_output=True, text=True)
-        print(f"LLVM: {llvm.stdout.strip()}")
-    except FileNotFoundError:
-        print("LLVM: llvm-config-14 not found")
-
-    bench_common.print_competitor_versions()
+# Data goes in as c_void_p so callers can pass a plain int address: no
+# pointer object is built or type-checked per call
+REDUCE_ARGTYPES = [ctypes.c_void_p, I32]
 
 
 def compile_ea_kernel():
-    """Compile Ea kernel to shared library"""
+    """Compile Ea kernel to shared library (skipped if kernel.so is current)"""
+    so_dst = BENCH_DIR / "kernel.so"
+    inspect_path = BENCH_DIR / "kernel.inspect.txt"
+    digest = bench_common.ea_kernel_digest(BENCH_DIR / "kernel.ea")
+    if bench_common.build_is_current(so_dst, digest):
+        print("Ea kernel up to date (kernel.so)")
+        if inspect_path.exists():
+            print("\n=== Kernel Analysis (ea inspect) ===")
+            print(inspect_path.read_text())
+        return
+
+    # Build the compiler once (if stale) and run it directly
+    compiler = bench_common.build_ea_compiler()
+    if compiler is None:
+        sys.exit(1)
+
     print("Compiling Ea kernel...")
-    ea_root = BENCH_DIR.parent.parent
     result = subprocess.run(
-        [
-            "cargo", "run", "--features=llvm", "--",
-            str(BENCH_DIR / "kernel.ea"), "--lib",
-        ],
-        capture_output=True, text=True, cwd=ea_root,
+        [str(compiler), "kernel.ea", "--lib"],
+        capture_output=True, cwd=BENCH_DIR,
     )
     if result.returncode != 0:
-        print(f"Ea compilation failed:\nstdout: {result.stdout}\n"
-              f"stderr: {result.stderr}")
+        print("Ea compilation failed:\n"
+              f"stdout: {bench_common.decode(result.stdout)}\n"
+              f"stderr: {bench_common.decode(result.stderr)}")
         sys.exit(1)
 
-    so_src = ea_root / "kernel.so"
-    so_dst = BENCH_DIR / "kernel.so"
-    if so_src.exists():
-        so_src.rename(so_dst)
-    elif not so_dst.exists():
+    if not so_dst.exists():
         print("Error: kernel.so not created")
         sys.exit(1)
 
+    # The compiler may have just been rebuilt
+    bench_common.record_build(
+        so_dst, bench_common.ea_kernel_digest(BENCH_DIR / "kernel.ea"))
     print("Ea kernel compiled successfully")
 
     # Show instruction analysis
-    ea_root = BENCH_DIR.parent.parent
     print("\n=== Kernel Analysis (ea inspect) ===")
     inspect = subprocess.run(
-        ["cargo", "run", "--features=llvm", "--",
-         "inspect", str(BENCH_DIR / "kernel.ea")],
-        capture_output=True, text=True, cwd=ea_root,
+        [str(compiler), "inspect", "kernel.ea"],
+        capture_output=True, cwd=BENCH_DIR,
     )
     if inspect.returncode == 0:
-        print(inspect.stdout)
+        text = bench_common.decode(inspect.stdout)
+        print(text)
+        inspect_path.write_text(text)
     else:
         print("  (ea inspect not available)")
 
 
 def compile_c_reference():
-    """Compile C reference with GCC and maximum optimization"""
-    print("Compiling C reference (GCC)...")
-    result = subprocess.run(
-        [
-            "gcc", "-O3", "-march=native", "-ffast-math",
-            "-shared", "-fPIC",
-            "reference.c", "-o", "reference.so",
-        ],
-        capture_output=True, text=True, cwd=BENCH_DIR,
+    """Compile C reference with GCC (skipped if reference.so is current)"""
+    cmd = [
+        "gcc", "-O3", "-march=native", "-ffast-math",
+        "-shared", "-fPIC", "-pipe",
+        "reference.c", "-o", "reference.so",
+    ]
+    so_path = BENCH_DIR / "reference.so"
+    digest = bench_common.build_digest(
+        BENCH_DIR / "reference.c",
+        extra=" ".join(cmd) + "\n" + bench_common.tool_version("gcc"),
     )
+    if bench_common.build_is_current(so_path, digest):
+        print("C reference up to date (reference.so)")
+        return
+
+    print("Compiling C reference (GCC)...")
+    result = subprocess.run(cmd, capture_output=True, cwd=BENCH_DIR,
+                            env=bench_common.compiler_env())
     if result.returncode != 0:
-        print(f"C compilation failed:\nstdout: {result.stdout}\n"
-              f"stderr: {result.stderr}")
+        print("C compilation failed:\n"
+              f"stdout: {bench_common.decode(result.stdout)}\n"
+              f"stderr: {bench_common.decode(result.stderr)}")
         sys.exit(1)
+    bench_common.record_build(so_path, digest)
     print("C reference compiled successfully")
 
 
@@ -147,26 +150,21 @@ def load_libraries():
     return ea_lib, c_lib
 
 
-def compile_and_load_competitors():
-    """Try to compile and load Clang, ISPC, and Rust competitors.
-
-    Returns a dict with keys 'sum', 'max', 'min', each mapping to a list
-    of (label, func) tuples.
-    """
-    competitors = {"sum": [], "max": [], "min": []}
-
-    # --- Clang ---
+def _build_clang():
+    """First installed Clang of 14/16/17/18, as {'sum'|'max'|'min': [...]}."""
     for ver in [14, 16, 17, 18]:
         clang = bench_common.has_clang(ver)
         if clang is None:
             continue
         so_name = f"reference_clang{ver}.so"
-        print(f"Compiling reductions with {clang}...")
-        ok = bench_common.compile_with_clang(
-            clang, "reference.c", so_name, BENCH_DIR
-        )
-        if not ok:
-            continue
+        if not bench_common.clang_is_current(clang, "reference.c", so_name,
+                                             BENCH_DIR):
+            print(f"Compiling reductions with {clang}...")
+            ok = bench_common.compile_with_clang(
+                clang, "reference.c", so_name, BENCH_DIR
+            )
+            if not ok:
+                continue
         lib = bench_common.try_load(BENCH_DIR / so_name, f"Clang-{ver}")
         if lib is None:
             continue
@@ -177,85 +175,193 @@ def compile_and_load_competitors():
         ]:
             _setup_reduce_fn(lib, name)
         tag = f"Clang-{ver}"
-        competitors["sum"].append((f"{tag} f32x8", lib.sum_f32x8_c))
-        competitors["sum"].append((f"{tag} f32x4", lib.sum_f32x4_c))
-        competitors["max"].append((f"{tag} f32x4", lib.max_f32x4_c))
-        competitors["min"].append((f"{tag} f32x4", lib.min_f32x4_c))
-        break  # Use first available clang version
-
-    # --- ISPC ---
-    if bench_common.has_ispc():
+        return {
+            "sum": [(f"{tag} f32x8", lib.sum_f32x8_c),
+                    (f"{tag} f32x4", lib.sum_f32x4_c)],
+            "max": [(f"{tag} f32x4", lib.max_f32x4_c)],
+            "min": [(f"{tag} f32x4", lib.min_f32x4_c)],
+        }
+    return {}
+
+
+def _build_ispc():
+    if not bench_common.has_ispc():
+        return {}
+    if not bench_common.ispc_is_current("reductions.ispc", "reductions_ispc.so",
+                                        BENCH_DIR):
         print("Compiling ISPC reduction kernels...")
         ok = bench_common.compile_ispc(
             "reductions.ispc", "reductions_ispc.so", BENCH_DIR
         )
-        if ok:
-            lib = bench_common.try_load(
-                BENCH_DIR / "reductions_ispc.so", "ISPC"
-            )
-            if lib:
-                _setup_reduce_fn(lib, "sum_ispc")
-                _setup_reduce_fn(lib, "max_ispc")
-                _setup_reduce_fn(lib, "min_ispc")
-                competitors["sum"].append(("ISPC", lib.sum_ispc))
-                competitors["max"].append(("ISPC", lib.max_ispc))
-                competitors["min"].append(("ISPC", lib.min_ispc))
-
-    # --- Rust std::simd ---
-    if bench_common.has_rust_nightly():
-        crate_dir = BENCH_DIR.parent / "rust_competitors"
-        print("Building Rust competitors...")
-        so_path = bench_common.compile_rust_competitors(crate_dir)
-        if so_path:
-            lib = bench_common.try_load(so_path, "Rust std::simd")
-            if lib:
-                _setup_reduce_fn(lib, "sum_f32x4_rust")
-                _setup_reduce_fn(lib, "sum_f32x8_rust")
-                _setup_reduce_fn(lib, "max_f32x4_rust")
-                _setup_reduce_fn(lib, "min_f32x4_rust")
-                competitors["sum"].append(
-                    ("Rust f32x8", lib.sum_f32x8_rust))
-                competitors["sum"].append(
-                    ("Rust f32x4", lib.sum_f32x4_rust))
-                competitors["max"].append(
-                    ("Rust f32x4", lib.max_f32x4_rust))
-                competitors["min"].append(
-                    ("Rust f32x4", lib.min_f32x4_rust))
+        if not ok:
+            return {}
+    lib = bench_common.try_load(BENCH_DIR / "reductions_ispc.so", "ISPC")
+    if lib is None:
+        return {}
+    _setup_reduce_fn(lib, "sum_ispc")
+    _setup_reduce_fn(lib, "max_ispc")
+    _setup_reduce_fn(lib, "min_ispc")
+    return {
+        "sum": [("ISPC", lib.sum_ispc)],
+        "max": [("ISPC", lib.max_ispc)],
+        "min": [("ISPC", lib.min_ispc)],
+    }
+
+
+def _build_rust():
+    if not bench_common.has_rust_nightly():
+        return {}
+    crate_dir = BENCH_DIR.parent / "rust_competitors"
+    print("Building Rust competitors...")
+    so_path = bench_common.compile_rust_competitors(crate_dir)
+    if not so_path:
+        return {}
+    lib = bench_common.try_load(so_path, "Rust std::simd")
+    if lib is None:
+        return {}
+    _setup_reduce_fn(lib, "sum_f32x4_rust")
+    _setup_reduce_fn(lib, "sum_f32x8_rust")
+    _setup_reduce_fn(lib, "max_f32x4_rust")
+    _setup_reduce_fn(lib, "min_f32x4_rust")
+    return {
+        "sum": [("Rust f32x8", lib.sum_f32x8_rust),
+                ("Rust f32x4", lib.sum_f32x4_rust)],
+        "max": [("Rust f32x4", lib.max_f32x4_rust)],
+        "min": [("Rust f32x4", lib.min_f32x4_rust)],
+    }
+
 
+def compile_and_load_competitors():
+    """Try to compile and load Clang, ISPC, and Rust competitors.
+
+    The three toolchains build concurrently (each is a subprocess, so
+    threads suffice); results keep the fixed Clang, ISPC, Rust order.
+    Returns a dict with keys 'sum', 'max', 'min', each mapping to a list
+    of (label, func) tuples.
+    """
+    builders = [_build_clang, _build_ispc, _build_rust]
+    with ThreadPoolExecutor(max_workers=len(builders)) as pool:
+        futures = [pool.submit(build) for build in builders]
+    competitors = {"sum": [], "max": [], "min": []}
+    for fut in futures:
+        for group, entries in fut.result().items():
+            competitors[group].extend(entries)
     return competitors
 
 
-def benchmark_reduction(func, data_ptr, size, description):
-    """Benchmark a single reduction function, return (avg_time, min_time, result)"""
-    for _ in range(WARMUP_RUNS):
-        func(data_ptr, size)
+def load_harness():
+    """Compile (if stale) and load bench_harness.c; None if gcc fails."""
+    so_path = BENCH_DIR / "bench_harness.so"
+    cmd = [
+        "gcc", "-O2", "-march=native", "-shared", "-fPIC", "-pipe",
+        "bench_harness.c", "-o", "bench_harness.so",
+    ]
+    digest = bench_common.build_digest(
+        BENCH_DIR / "bench_harness.c",
+        extra=" ".join(cmd) + "\n" + bench_common.tool_version("gcc"),
+    )
+    if not bench_common.build_is_current(so_path, digest):
+        result = subprocess.run(cmd, capture_output=True, cwd=BENCH_DIR,
+                                env=bench_common.compiler_env())
+        if result.returncode != 0:
+            stderr = bench_common.decode(result.stderr).strip()
+            print(f"  Timing harness compilation failed: {stderr}")
+            return None
+        bench_common.record_build(so_path, digest)
+    lib = bench_common.try_load(so_path, "timing harness")
+    if lib is None:
+        return None
+    lib.run_times.argtypes = [ctypes.c_void_p, ctypes.c_void_p, I32, I32,
+                              ctypes.c_void_p]
+    lib.run_times.restype = F32
+    lib.evict_caches.argtypes = [ctypes.c_void_p, ctypes.c_int64]
+    lib.evict_caches.restype = None
+    return lib
+
+
+def evict_caches(scratch, harness=None):
+    """Touch every line of `scratch` so no variant inherits cache contents
+    from the one before it."""
+    if harness is not None:
+        harness.evict_caches(scratch.ctypes.data, scratch.nbytes)
+    else:
+        scratch[::64] += 1
 
-    times = []
-    result = None
-    for _ in range(NUM_RUNS):
-        start = time.perf_counter()
-        result = func(data_ptr, size)
-        end = time.perf_counter()
-        times.append(end - start)
 
-    avg_time = sum(times) / len(times)
-    min_time = min(times)
-    return avg_time, min_time, result
+def _converged(times_ns):
+    """True once the 5th percentile sits within CONVERGENCE of the minimum."""
+    lo = times_ns.min()
+    if lo <= 0:
+        return False
+    return (np.percentile(times_ns, 5) - lo) / lo < CONVERGENCE
+
+
+def benchmark_reduction(func, data_addr, size, description, harness=None):
+    """Benchmark a single reduction function.
+
+    Returns (avg_time, min_time, result, times): times is the per-call
+    sample array in seconds, MIN_RUNS to MAX_RUNS long depending on
+    how quickly the minimum settles (see _converged).
 
+    With the C harness (load_harness) the timing loop runs in C; otherwise
+    each sample times BATCH back-to-back calls from Python.
+    """
+    # c_int32 converted once, outside any timed loop
+    n = I32(size)
+    if harness is not None:
+        fn_ptr = ctypes.cast(func, ctypes.c_void_p)
+        times_ns = np.empty(max(MAX_RUNS, WARMUP_RUNS), dtype=np.uint64)
+        base = times_ns.ctypes.data
+        harness.run_times(fn_ptr, data_addr, n, WARMUP_RUNS, base)
+        runs = 0
+        while True:
+            result = harness.run_times(fn_ptr, data_addr, n, SAMPLE_CHUNK,
+                                       base + runs * times_ns.itemsize)
+            runs += SAMPLE_CHUNK
+            if runs >= MAX_RUNS or (runs >= MIN_RUNS
+                                     and _converged(times_ns[:runs])):
+                break
+        times = times_ns[:runs] * 1e-9
+        return float(times.mean()), float(times.min()), result, times
+
+    _fn = func
+    _now = time.perf_counter_ns
+    for _ in range(WARMUP_RUNS):
+        _fn(data_addr, n)
 
-def verify_correctness(ea_lib, c_lib, data_ptr, size):
+    # Unboxed int64 samples, reduced by NumPy rather than sum()/min()
+    times_ns = np.empty(MAX_RUNS, dtype=np.int64)
+    batch = range(BATCH)
+    result = None
+    runs = 0
+    while True:
+        for r in range(runs, runs + SAMPLE_CHUNK):
+            start = _now()
+            for _ in batch:
+                result = _fn(data_addr, n)
+            times_ns[r] = _now() - start
+        runs += SAMPLE_CHUNK
+        if runs >= MAX_RUNS or (runs >= MIN_RUNS
+                                 and _converged(times_ns[:runs])):
+            break
+
+    times = times_ns[:runs] / BATCH * 1e-9
+    return float(times.mean()), float(times.min()), result, times
+
+
+def verify_correctness(ea_lib, c_lib, data_addr, size):
     """Verify Ea and C produce matching results"""
     print("Verifying correctness...")
 
-    ea_sum4 = ea_lib.sum_f32x4(data_ptr, size)
-    ea_sum8 = ea_lib.sum_f32x8(data_ptr, size)
-    c_sum = c_lib.sum_scalar_c(data_ptr, size)
+    ea_sum4 = ea_lib.sum_f32x4(data_addr, size)
+    ea_sum8 = ea_lib.sum_f32x8(data_addr, size)
+    c_sum = c_lib.sum_scalar_c(data_addr, size)
 
-    ea_max = ea_lib.max_f32x4(data_ptr, size)
-    c_max = c_lib.max_scalar_c(data_ptr, size)
+    ea_max = ea_lib.max_f32x4(data_addr, size)
+    c_max = c_lib.max_scalar_c(data_addr, size)
 
-    ea_min = ea_lib.min_f32x4(data_ptr, size)
-    c_min = c_lib.min_scalar_c(data_ptr, size)
+    ea_min = ea_lib.min_f32x4(data_addr, size)
+    c_min = c_lib.min_scalar_c(data_addr, size)
 
     def check(name, ea_val, c_val, rtol=1e-2):
         if abs(ea_val - c_val) > abs(c_val) * rtol + 1e-5:
@@ -273,17 +379,59 @@ def verify_correctness(ea_lib, c_lib, data_ptr, size):
         print("  Correctness verified")
     else:
         print("  WARNING: some results differ (may be FP ordering)")
+    return ok
+
 
+def _verify_key(size):
+    """Identity of one verification: both libraries' size and mtime, plus the
+    input (seed and length)."""
+    parts = [f"seed={SEED} size={size}"]
+    for name in ("kernel.so", "reference.so"):
+        st = (BENCH_DIR / name).stat()
+        parts.append(f"{name}:{st.st_size}:{st.st_mtime_ns}")
+    return bench_common.build_digest(extra="\n".join(parts))
 
-def run_benchmark_group(name, variants, data_ptr, size):
-    """Run a group of benchmarks and print a unified result table."""
+
+def verify_correctness_cached(ea_lib, c_lib, data_addr, size):
+    """verify_correctness, skipped when these exact builds already passed on
+    this input. Passes are remembered in VERIFY_CACHE; failures never are."""
+    key = _verify_key(size)
+    try:
+        cache = json.loads(VERIFY_CACHE.read_text())
+    except (OSError, ValueError):
+        cache = {}
+    if cache.get(key):
+        print("Correctness: verified earlier for these builds (cached)")
+        return True
+    ok = verify_correctness(ea_lib, c_lib, data_addr, size)
+    if ok:
+        cache[key] = True
+        VERIFY_CACHE.write_text(json.dumps(cache, indent=2) + "\n")
+    return ok
+
+
+def run_benchmark_group(name, variants, data_addr, size, harness=None,
+                        scratch=None, records=None):
+    """Run a group of benchmarks and print a unified result table.
+
+    With a scratch buffer, caches are evicted before each variant, so every
+    one starts (and warms up) from the same cold state. If a records list is
+    given, one machine-readable dict per variant is appended to it.
+    """
     print(f"\n--- {name} ---")
 
     results = {}
+    percentiles = {}
+    run_counts = {}
     for label, func in variants:
-        avg, mint, val = benchmark_reduction(func, data_ptr, size, label)
+        if scratch is not None:
+            evict_caches(scratch, harness)
+        avg, mint, val, times = benchmark_reduction(func, data_addr, size,
+                                                    label, harness)
         results[label] = (avg, mint, val)
-        sys.stdout.write(f"  {label}: done\n")
+        percentiles[label] = np.percentile(times, [50, 99])
+        run_counts[label] = len(times)
+        sys.stdout.write(f"  {label}: done ({len(times)} runs)\n")
 
     # Baseline = fastest C SIMD entry (labels starting with "C " or "GCC ")
     c_labels = [l for l, _ in variants
@@ -303,16 +451,52 @@ def run_benchmark_group(name, variants, data_ptr, size):
         print(f"  {label:<22} | {avg*1e6:>10.1f} | {mint*1e6:>10.1f} "
               f"| {ratio:>9.3f}x")
 
+    if records is not None:
+        for label, _ in variants:
+            avg, mint, val = results[label]
+            p50, p99 = percentiles[label]
+            records.append({
+                "group": name, "variant": label,
+                "avg_ns": avg * 1e9, "min_ns": mint * 1e9,
+                "p50_ns": p50 * 1e9, "p99_ns": p99 * 1e9,
+                "result": float(val), "baseline_ratio": avg / baseline_avg,
+                "runs": run_counts[label],
+            })
+
     return results
 
 
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--pin", action="store_true",
+        help="pin to one CPU ($BENCH_CPU or the fastest allowed), raise "
+             "scheduling priority, request the performance governor and "
+             "lock memory",
+    )
+    parser.add_argument(
+        "--no-competitors", action="store_true",
+        help="skip building and timing Clang, ISPC and Rust",
+    )
+    parser.add_argument(
+        "--json", metavar="PATH",
+        help="also write every variant's timings and result to PATH",
+    )
+    return parser.parse_args()
+
+
 def main():
+    args = parse_args()
     os.chdir(BENCH_DIR)
 
     print("=== Horizontal Reduction Benchmark ===")
-    print_environment()
+    bench_common.print_environment()
     print(f"Array size: {ARRAY_SIZE:,} elements")
-    print(f"Runs per test: {NUM_RUNS}")
+    print(f"Runs per test: {MIN_RUNS}-{MAX_RUNS}, until p5 is within "
+          f"{CONVERGENCE:.0%} of the minimum")
+    if args.pin:
+        bench_common.pin_to_cpu()
+        bench_common.lock_memory()
     print()
 
     compile_ea_kernel()
@@ -320,13 +504,24 @@ def main():
     ea_lib, c_lib = load_libraries()
 
     # Compile competitors (graceful — missing tools are skipped)
-    comp = compile_and_load_competitors()
+    if args.no_competitors:
+        comp = {"sum": [], "max": [], "min": []}
+    else:
+        comp = compile_and_load_competitors()
 
-    np.random.seed(42)
-    data = np.random.uniform(-100.0, 100.0, ARRAY_SIZE).astype(np.float32)
-    data_ptr = data.ctypes.data_as(FLOAT_PTR)
+    # 2 MiB-aligned, huge-page backed: no split-line loads, few TLB entries.
+    # Generated in place as float32, with no float64 temporary.
+    rng = np.random.default_rng(SEED)
+    data = bench_common.uniform_array(rng, ARRAY_SIZE, -100.0, 100.0)
+    # Raw int address: every kernel call marshals a plain c_void_p
+    data_addr = data.ctypes.data
 
-    verify_correctness(ea_lib, c_lib, data_ptr, ARRAY_SIZE)
+    verify_correctness_cached(ea_lib, c_lib, data_addr, ARRAY_SIZE)
+
+    # Time in C: one ctypes call per measurement, not one per kernel call
+    harness = load_harness()
+    scratch = bench_common.aligned_array(EVICT_BYTES, np.uint8)
+    records = []
 
     # --- Sum benchmarks ---
     sum_variants = [
@@ -340,7 +535,8 @@ def main():
     ]
     sum_variants.extend(comp["sum"])
     sum_results = run_benchmark_group(
-        "Sum Reduction", sum_variants, data_ptr, ARRAY_SIZE
+        "Sum Reduction", sum_variants, data_addr, ARRAY_SIZE, harness,
+        scratch, records
     )
 
     # --- Max benchmarks ---
@@ -351,7 +547,8 @@ def main():
     ]
     max_variants.extend(comp["max"])
     max_results = run_benchmark_group(
-        "Max Reduction", max_variants, data_ptr, ARRAY_SIZE
+        "Max Reduction", max_variants, data_addr, ARRAY_SIZE, harness,
+        scratch, records
     )
 
     # --- Min benchmarks ---
@@ -362,7 +559,8 @@ def main():
     ]
     min_variants.extend(comp["min"])
     min_results = run_benchmark_group(
-        "Min Reduction", min_variants, data_ptr, ARRAY_SIZE
+        "Min Reduction", min_variants, data_addr, ARRAY_SIZE, harness,
+        scratch, records
     )
 
     # --- Summary ---
@@ -388,6 +586,15 @@ def main():
     simd_speedup = scalar_avg / c_sum8_avg
     print(f"\nSIMD speedup (C scalar vs C f32x8): {simd_speedup:.1f}x")
 
+    if args.json:
+        bench_common.write_json_report(args.json, {
+            "benchmark": "horizontal_reduction",
+            "array_size": ARRAY_SIZE,
+            "max_runs": MAX_RUNS,
+            "timer": "c_harness" if harness is not None else "python",
+            "variants": records,
+        })
+
 
 if __name__ == "__main__":
     main()
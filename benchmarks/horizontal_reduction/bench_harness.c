@@ -0,0 +1,45 @@
+// Timing harness: runs a reduction kernel `runs` times and records each
+// call's duration, so Python crosses the ctypes boundary once per
+// measurement instead of once per call.
+#define _GNU_SOURCE
+#include <stdint.h>
+#include <time.h>
+
+typedef float (*reduce_fn)(const float*, int32_t);
+
+static uint64_t now_ns(void) {
+    struct timespec ts;
+#ifdef CLOCK_MONOTONIC_RAW
+    clock_gettime(CLOCK_MONOTONIC_RAW, &ts);
+#else
+    clock_gettime(CLOCK_MONOTONIC, &ts);
+#endif
+    return (uint64_t)ts.tv_sec * 1000000000ull + (uint64_t)ts.tv_nsec;
+}
+
+// Returns the last call's result so the caller can report it.
+float run_times(
+    reduce_fn fn,
+    const float* data,
+    int32_t len,
+    int32_t runs,
+    uint64_t* out_ns
+) {
+    float result = 0.0f;
+    for (int32_t r = 0; r < runs; r++) {
+        uint64_t t0 = now_ns();
+        result = fn(data, len);
+        out_ns[r] = now_ns() - t0;
+    }
+    return result;
+}
+
+// Write one byte per cache line of a buffer larger than the LLC, evicting
+// whatever the previous kernel left resident. Volatile so the stores are
+// not merged or dropped.
+void evict_caches(uint8_t* scratch, int64_t bytes) {
+    volatile uint8_t* p = scratch;
+    for (int64_t off = 0; off < bytes; off += 64) {
+        p[off] = (uint8_t)(p[off] + 1);
+    }
+}
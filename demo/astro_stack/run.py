@@ -11,21 +11,49 @@ Usage:
 Default: 16 frames from NASA SkyView (or synthetic if unavailable).
 """
 
+import functools
+import math
+import os
 import sys
 import time
 import ctypes
 import subprocess
 import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import numpy as np
 
+try:
+    import numba
+except ImportError:
+    numba = None  # stars are rendered with the NumPy fallback
+
+try:
+    import cupy as cp
+except ImportError:
+    cp = None  # the GPU variant is skipped
+
 DEMO_DIR = Path(__file__).parent
 EA_ROOT = DEMO_DIR / ".." / ".."
 
 N_FRAMES = 16
 NOISE_SIGMA = 0.05
 
-FLOAT_PTR = ctypes.POINTER(ctypes.c_float)
+# Kernel pointers are passed as raw addresses so tiles can be offset with
+# plain integer arithmetic instead of a ctypes cast per call.
+ADDR = ctypes.c_void_p
+
+# Pixels per accumulation tile: 256 KB of accumulator, small enough to stay
+# in L2 while every frame's matching tile streams through it.
+STACK_TILE = 65536
+
+# mean_many_1mpx_f32x8 has the frame size and tile size compiled in
+# (FRAME_PIXELS / TILE_PIXELS in stack.ea); used when the image matches.
+SPECIALIZED_PIXELS = 1024 * 1024
+SPECIALIZED_TILE = 65536
+
+# Q0.15 fixed point: 1.0 maps to 32767, so a u16 pixel sums exactly in int32.
+Q15_ONE = 32767
 
 NASA_SKYVIEW_URL = "https://skyview.gsfc.nasa.gov/current/cgi/runquery.pl"
 
@@ -45,10 +73,14 @@ def download_nasa_frames(n_frames=16):
     data_dir.mkdir(exist_ok=True)
 
     # Check if we already have frames
-    existing = sorted(data_dir.glob("frame_*.npy"))
-    if len(existing) >= n_frames:
-        print(f"  Using cached NASA data ({len(existing)} frames)")
-        return [np.load(str(f)) for f in existing[:n_frames]]
+    frames_path = data_dir / "frames.npy"
+    if frames_path.exists():
+        # Memory-mapped (N, H, W) block: pages are read on first touch, not
+        # all up front, and the block is handed to the kernels as-is
+        cached = np.load(str(frames_path), mmap_mode='r')
+        if len(cached) >= n_frames:
+            print(f"  Using cached NASA data ({len(cached)} frames)")
+            return cached[:n_frames]
 
     # Download a DSS image of M31 (Andromeda galaxy)
     print("Downloading NASA SkyView data (M31 / Andromeda)...")
@@ -89,14 +121,8 @@ def download_nasa_frames(n_frames=16):
 
         # Generate N "exposures" by adding realistic noise to the real image
         # This simulates multiple telescope exposures of the same field
-        rng = np.random.RandomState(100)
-        frames = []
-        for i in range(n_frames):
-            noise = rng.normal(0, NOISE_SIGMA, img.shape).astype(np.float32)
-            frame = np.clip(img + noise, 0.0, 1.0)
-            frame_path = data_dir / f"frame_{i:03d}.npy"
-            np.save(str(frame_path), frame)
-            frames.append(frame)
+        frames = generate_noisy_frames(img, n_frames, NOISE_SIGMA)
+        np.save(str(frames_path), frames)
 
         # Save reference
         np.save(str(data_dir / "reference.npy"), img)
@@ -109,35 +135,51 @@ def download_nasa_frames(n_frames=16):
         return None
 
 
+FITS_BLOCK = 2880  # header and data are stored in 2880-byte blocks
+FITS_CARD = 80     # of 80-byte keyword cards
+
+
+def _fits_card_offset(header, key, start=0):
+    """Byte offset of the card with this keyword, or -1.
+
+    Searches the raw header bytes; a match only counts at a card boundary,
+    so the keyword text appearing inside another card's value is skipped.
+    """
+    pattern = key.ljust(8)
+    idx = header.find(pattern, start)
+    while idx != -1 and idx % FITS_CARD:
+        idx = header.find(pattern, idx + 1)
+    return idx
+
+
+def _fits_int(header, key):
+    """Integer value of a `KEY     = value` card, or None if absent."""
+    off = _fits_card_offset(header, key)
+    if off == -1 or header[off + 8:off + 10] != b'= ':
+        return None
+    return int(header[off + 10:off + 30])
+
+
 def _read_simple_fits(path):
     """Minimal FITS reader for simple 2D images. No dependencies."""
     try:
         with open(str(path), 'rb') as f:
-            # Read primary header
-            header = {}
+            # Read primary header blocks up to the END card, as raw bytes
+            header = bytearray()
             while True:
-                block = f.read(2880)
-                if not block:
+                block = f.read(FITS_BLOCK)
+                if len(block) < FITS_BLOCK:
                     return None
-                text = block.decode('ascii', errors='replace')
-                for i in range(0, len(text), 80):
-                    card = text[i:i+80]
-                    if card.startswith('END'):
-                        break
-                    if len(card) > 8 and card[8] == '=':
-                        key = card[:8].strip()
-                        val = card[10:30].strip().strip("'").strip()
-                        header[key] = val
-                if 'END' in text:
+                header += block
+                if _fits_card_offset(header, b'END', len(header) - FITS_BLOCK) != -1:
                     break
 
-            naxis = int(header.get('NAXIS', 0))
-            if naxis != 2:
+            if _fits_int(header, b'NAXIS') != 2:
                 return None
 
-            naxis1 = int(header['NAXIS1'])
-            naxis2 = int(header['NAXIS2'])
-            bitpix = int(header['BITPIX'])
+            naxis1 = _fits_int(header, b'NAXIS1')
+            naxis2 = _fits_int(header, b'NAXIS2')
+            bitpix = _fits_int(header, b'BITPIX')
 
             if bitpix == -32:
                 dtype = np.float32
@@ -150,12 +192,12 @@ def _read_simple_fits(path):
             else:
                 return None
 
-            # FITS stores data in big-endian byte order
+            # FITS stores data in big-endian byte order; a single astype
+            # does the byte swap and the float32 conversion in one pass
             be_dtype = np.dtype(dtype).newbyteorder('>')
             data = np.frombuffer(
                 f.read(naxis1 * naxis2 * abs(bitpix) // 8), dtype=be_dtype
             )
-            data = data.astype(dtype)
             return data.reshape(naxis2, naxis1).astype(np.float32)
     except Exception:
         return None
@@ -165,13 +207,55 @@ def _read_simple_fits(path):
 # Starfield generation
 # ---------------------------------------------------------------------------
 
+STAR_CUTOFF_SIGMAS = 5.0  # a star's contribution is dropped beyond this radius
+
+
+def _add_stars_numpy(img, stars, xx, yy):
+    """Add each star as a full-frame gaussian (one exp per pixel per star)."""
+    for cx, cy, brightness, sigma in stars:
+        r2 = (xx - cx) ** 2 + (yy - cy) ** 2
+        star = brightness * np.exp(-r2 / (2 * sigma ** 2))
+        img += star.astype(np.float32)
+
+
+if numba is not None:
+    @numba.njit(parallel=True, fastmath=True, cache=True)
+    def _add_stars_numba(img, stars):
+        """Add stars row-parallel, visiting only pixels within the cutoff.
+
+        stars is (n_stars, 4) of (cx, cy, brightness, sigma). Each row is
+        written by one thread, so no synchronization is needed.
+        """
+        height, width = img.shape
+        for y in numba.prange(height):
+            for s in range(stars.shape[0]):
+                cx = stars[s, 0]
+                cy = stars[s, 1]
+                brightness = stars[s, 2]
+                sigma = stars[s, 3]
+                reach = STAR_CUTOFF_SIGMAS * sigma
+                dy = y - cy
+                if dy * dy > reach * reach:
+                    continue
+                inv_2sigma2 = 1.0 / (2.0 * sigma * sigma)
+                x0 = max(0, int(math.floor(cx - reach)))
+                x1 = min(width, int(math.ceil(cx + reach)) + 1)
+                for x in range(x0, x1):
+                    dx = x - cx
+                    r2 = dx * dx + dy * dy
+                    if r2 <= reach * reach:
+                        img[y, x] += brightness * math.exp(-r2 * inv_2sigma2)
+
+
 def generate_starfield(width=1024, height=1024, seed=42):
     """Generate a synthetic starfield: stars as 2D gaussians, a nebula, sky glow."""
     rng = np.random.RandomState(seed)
     img = np.zeros((height, width), dtype=np.float32)
 
-    # Sky glow background
-    yy, xx = np.mgrid[0:height, 0:width]
+    # Open grids: (H, 1) and (1, W), broadcast only where a full frame is needed
+    yy, xx = np.ogrid[0:height, 0:width]
+
+    # Sky glow background (a function of y only: stays (H, 1) until the add)
     img += 0.02 + 0.01 * np.exp(-((yy - height * 0.5) ** 2) / (2 * (height * 0.4) ** 2))
 
     # Nebula: broad elliptical glow
@@ -183,14 +267,17 @@ def generate_starfield(width=1024, height=1024, seed=42):
 
     # Stars: 60-80 point sources as 2D gaussians
     n_stars = rng.randint(60, 81)
-    for _ in range(n_stars):
+    stars = np.empty((n_stars, 4), dtype=np.float64)
+    for i in range(n_stars):
         cx = rng.uniform(0, width)
         cy = rng.uniform(0, height)
         brightness = rng.uniform(0.3, 1.0)
         sigma = rng.uniform(1.0, 3.0)
-        r2 = (xx - cx) ** 2 + (yy - cy) ** 2
-        star = brightness * np.exp(-r2 / (2 * sigma ** 2))
-        img += star.astype(np.float32)
+        stars[i] = (cx, cy, brightness, sigma)
+    if numba is not None:
+        _add_stars_numba(img, stars)
+    else:
+        _add_stars_numpy(img, stars, xx, yy)
 
     img = np.clip(img, 0.0, 1.0)
     return img
@@ -200,15 +287,39 @@ def generate_starfield(width=1024, height=1024, seed=42):
 # Noise generation
 # ---------------------------------------------------------------------------
 
+if numba is not None:
+    @numba.njit(parallel=True, fastmath=True, cache=True)
+    def _add_noise_clip(noise, reference, sigma):
+        """noise[k] = clip(reference + noise[k] * sigma, 0, 1), in one pass.
+
+        min/max compile to branchless vminps/vmaxps.
+        """
+        n_frames = noise.shape[0]
+        pixels = reference.size
+        for k in numba.prange(n_frames):
+            for i in range(pixels):
+                v = reference[i] + noise[k, i] * sigma
+                noise[k, i] = min(np.float32(1.0), max(np.float32(0.0), v))
+
+
 def generate_noisy_frames(reference, n_frames, sigma, seed=100):
-    """Generate n_frames noisy copies of reference, each with gaussian noise."""
-    rng = np.random.RandomState(seed)
-    frames = []
-    for _ in range(n_frames):
-        noise = rng.normal(0, sigma, reference.shape).astype(np.float32)
-        noisy = np.clip(reference + noise, 0.0, 1.0)
-        frames.append(noisy)
-    return frames
+    """Generate n_frames noisy copies of reference, each with gaussian noise.
+
+    All noise is drawn in one call, directly as float32 (no float64 draw and
+    cast), then scaled, offset and clipped in place. Returns that one
+    (n_frames, H, W) float32 block; frame k is block[k].
+    """
+    rng = np.random.default_rng(seed)
+    noisy = rng.standard_normal((n_frames,) + reference.shape, dtype=np.float32)
+    if numba is not None:
+        _add_noise_clip(noisy.reshape(n_frames, -1),
+                        np.ascontiguousarray(reference, dtype=np.float32).ravel(),
+                        np.float32(sigma))
+    else:
+        noisy *= np.float32(sigma)
+        noisy += reference
+        np.clip(noisy, 0.0, 1.0, out=noisy)
+    return noisy
 
 
 # ---------------------------------------------------------------------------
@@ -292,69 +403,284 @@ def build_ea_kernel():
 # ---------------------------------------------------------------------------
 
 def stack_numpy(frames):
-    """Stack frames by averaging. Uses O(N*pixels) memory."""
-    return np.mean(np.array(frames), axis=0)
+    """Stack frames by averaging into one accumulator. Uses O(pixels) memory.
+
+    Same streaming shape as the Ea version, so the comparison measures the
+    kernels rather than np.array(frames) building an N*pixels copy.
+    """
+    acc = np.zeros(frames[0].shape, dtype=np.float32)
+    for frame in frames:
+        acc += frame
+    acc *= np.float32(1.0 / len(frames))
+    return acc
+
+
+def has_gpu():
+    """True if CuPy is installed and can see a CUDA/HIP device."""
+    if cp is None:
+        return False
+    try:
+        return cp.cuda.runtime.getDeviceCount() > 0
+    except cp.cuda.runtime.CUDARuntimeError:
+        return False
+
+
+@functools.lru_cache(maxsize=None)
+def _cupy_mean_kernel():
+    # One thread per pixel: sum that pixel across all frames, write the mean
+    return cp.ElementwiseKernel(
+        "raw T frames, int32 n_frames, int32 stride", "T out",
+        "T s = 0; "
+        "for (int k = 0; k < n_frames; ++k) s += frames[k * stride + i]; "
+        "out = s / n_frames;",
+        "stack_mean",
+    )
+
 
+def stack_cupy(frames_block):
+    """Stack a frame_block on the GPU with a one-pass CuPy kernel.
 
+    Includes the host-to-device upload of all frames and the download of the
+    result, so the time is comparable with the CPU variants.
+    """
+    n_frames, h, w = frames_block.shape
+    frames_gpu = cp.asarray(frames_block)
+    out = cp.empty((h, w), dtype=cp.float32)
+    _cupy_mean_kernel()(frames_gpu, np.int32(n_frames), np.int32(h * w), out)
+    return cp.asnumpy(out)
+
+
+@functools.lru_cache(maxsize=None)
 def _load_ea_lib(so_path):
-    """Load Ea shared library and set up function signatures."""
+    """Load Ea shared library and set up function signatures.
+
+    Cached per path: the dlopen and argtypes setup happen once per process
+    however many times stacking is set up.
+    """
     lib = ctypes.CDLL(str(so_path))
-    lib.accumulate_f32x8.argtypes = [FLOAT_PTR, FLOAT_PTR, ctypes.c_int32]
+    lib.accumulate_f32x8.argtypes = [ADDR, ADDR, ctypes.c_int32]
     lib.accumulate_f32x8.restype = None
-    lib.accumulate_foreach.argtypes = [FLOAT_PTR, FLOAT_PTR, ctypes.c_int32]
+    lib.accumulate_foreach.argtypes = [ADDR, ADDR, ctypes.c_int32]
     lib.accumulate_foreach.restype = None
-    lib.scale_f32x8.argtypes = [FLOAT_PTR, FLOAT_PTR, ctypes.c_int32, ctypes.c_float]
+    lib.scale_f32x8.argtypes = [ADDR, ADDR, ctypes.c_int32, ctypes.c_float]
     lib.scale_f32x8.restype = None
+    lib.accumulate_and_scale_f32x8.argtypes = [
+        ADDR, ADDR, ctypes.c_int32, ctypes.c_float]
+    lib.accumulate_and_scale_f32x8.restype = None
+    lib.accumulate_q15_i32.argtypes = [ADDR, ADDR, ctypes.c_int32]
+    lib.accumulate_q15_i32.restype = None
+    lib.mean_many_f32x8.argtypes = [
+        ADDR, ADDR, ctypes.c_int32, ctypes.c_int32, ctypes.c_int32,
+        ctypes.c_float]
+    lib.mean_many_f32x8.restype = None
+    lib.mean_many_1mpx_f32x8.argtypes = [
+        ADDR, ADDR, ctypes.c_int32, ctypes.c_float]
+    lib.mean_many_1mpx_f32x8.restype = None
+    lib.running_mean_f32x8.argtypes = [
+        ADDR, ADDR, ctypes.c_int32, ctypes.c_float]
+    lib.running_mean_f32x8.restype = None
     return lib
 
 
-def _stack_ea_impl(frames, lib, accumulate_fn):
-    """Common stacking logic using a given accumulate function."""
-    h, w = frames[0].shape
+def frame_block(frames):
+    """All frames as one contiguous (N, H, W) float32 block.
+
+    One base pointer with frame k at a fixed stride, instead of N separate
+    heap allocations: kernels can walk every frame from a single call.
+
+    Frames that already are such a block (generate_noisy_frames, the
+    memory-mapped NASA cache), or consecutive views into one, are used in
+    place; only a list of separate arrays is copied.
+    """
+    if isinstance(frames, np.ndarray):
+        block = frames
+    else:
+        base = frames[0].base
+        block = None
+        if (isinstance(base, np.ndarray) and base.ndim == 3
+                and base.flags.c_contiguous):
+            first = (frames[0].ctypes.data - base.ctypes.data) // base.strides[0]
+            block = base[first:first + len(frames)]
+            if not (len(block) == len(frames) and all(
+                    f.shape == block.shape[1:]
+                    and f.ctypes.data == block[k].ctypes.data
+                    for k, f in enumerate(frames))):
+                block = None
+        if block is None:
+            block = np.stack(frames)
+    if block.dtype == np.float32 and block.flags.c_contiguous:
+        return block
+    return np.ascontiguousarray(block, dtype=np.float32)
+
+
+@functools.lru_cache(maxsize=None)
+def _tile_pool():
+    """Worker threads for tiles; ctypes releases the GIL around kernel calls."""
+    return ThreadPoolExecutor(max_workers=os.cpu_count())
+
+
+def _stack_ea_impl(frames_block, acc, stack_tile):
+    """Run stack_tile(acc_addr, frames_addr, count) over STACK_TILE-pixel tiles.
+
+    Each call sees one tile of the accumulator and the same offset into
+    frame 0 of the block; later frames are at multiples of the block's frame
+    stride from there. Finishing every frame for one tile before moving on
+    keeps the tile cache-resident. Tiles don't overlap, so on multi-core
+    machines they are spread across a thread pool with no locking.
+    """
+    _, h, w = frames_block.shape
     n = h * w
-    acc = np.zeros(n, dtype=np.float32)
+    acc_addr = acc.ctypes.data
+    frames_addr = frames_block.ctypes.data
+    itemsize = acc.itemsize
 
-    for frame in frames:
-        flat = np.ascontiguousarray(frame, dtype=np.float32).ravel()
-        accumulate_fn(
-            acc.ctypes.data_as(FLOAT_PTR),
-            flat.ctypes.data_as(FLOAT_PTR),
-            n,
-        )
-
-    out = np.zeros(n, dtype=np.float32)
-    lib.scale_f32x8(
-        acc.ctypes.data_as(FLOAT_PTR),
-        out.ctypes.data_as(FLOAT_PTR),
-        n,
-        ctypes.c_float(1.0 / len(frames)),
-    )
-    return out.reshape(h, w)
+    def run_tile(t0):
+        off = t0 * itemsize
+        stack_tile(acc_addr + off, frames_addr + off, min(STACK_TILE, n - t0))
+
+    tiles = range(0, n, STACK_TILE)
+    if (os.cpu_count() or 1) > 1 and len(tiles) > 1:
+        list(_tile_pool().map(run_tile, tiles))  # re-raises worker errors
+    else:
+        for t0 in tiles:
+            run_tile(t0)
+    return acc.reshape(h, w)
+
+
+def stack_ea_setup(so_path, n_pixels):
+    """Load the Ea library and allocate the accumulator, once per process.
+
+    Returns (lib, acc_buf) for stack_ea_run / stack_ea_foreach_run.
+    """
+    return _load_ea_lib(so_path), np.zeros(n_pixels, dtype=np.float32)
 
 
-def stack_ea(frames, so_path):
-    """Stack frames using Ea f32x8 SIMD kernels."""
-    lib = _load_ea_lib(so_path)
-    return _stack_ea_impl(frames, lib, lib.accumulate_f32x8)
+def stack_ea_run(lib, acc_buf, frames_block):
+    """Stack a frame_block using the Ea f32x8 mean_many kernel.
+
+    One kernel call per tile sums all N frames in registers and writes the
+    mean, so Python does no per-frame work. The result is a view of
+    acc_buf, overwritten by the next run.
+    """
+    n_frames, h, w = frames_block.shape
+    scale = ctypes.c_float(1.0 / n_frames)
+
+    if h * w == SPECIALIZED_PIXELS and STACK_TILE == SPECIALIZED_TILE:
+        # Every tile is full-size, so the constant-size entry point applies
+        mean_many = lib.mean_many_1mpx_f32x8
+
+        def stack_tile(acc_addr, frames_addr, count):
+            mean_many(acc_addr, frames_addr, n_frames, scale)
+    else:
+        mean_many = lib.mean_many_f32x8
+
+        def stack_tile(acc_addr, frames_addr, count):
+            mean_many(acc_addr, frames_addr, n_frames, h * w, count, scale)
+
+    return _stack_ea_impl(frames_block, acc_buf, stack_tile)
+
+
+def stack_ea_foreach_run(lib, acc_buf, frames_block):
+    """Stack a frame_block using Ea foreach (auto-vectorized) kernel.
+
+    One accumulate call per frame per tile; the last frame goes through
+    accumulate_and_scale_f32x8, which applies the 1/N scale in the same
+    pass. The result is a view of acc_buf, overwritten by the next run.
+    """
+    n_frames = len(frames_block)
+    stride = frames_block.strides[0]
+    scale = ctypes.c_float(1.0 / n_frames)
+    accumulate = lib.accumulate_foreach
+    finish = lib.accumulate_and_scale_f32x8
+    acc_buf.fill(0.0)
+
+    def stack_tile(acc_addr, frames_addr, count):
+        for k in range(n_frames - 1):
+            accumulate(acc_addr, frames_addr + k * stride, count)
+        finish(acc_addr, frames_addr + (n_frames - 1) * stride, count, scale)
 
+    return _stack_ea_impl(frames_block, acc_buf, stack_tile)
 
-def stack_ea_foreach(frames, so_path):
-    """Stack frames using Ea foreach (auto-vectorized) kernel."""
-    lib = _load_ea_lib(so_path)
-    return _stack_ea_impl(frames, lib, lib.accumulate_foreach)
+
+def stack_ea_running_mean_run(lib, acc_buf, frames_block):
+    """Stack a frame_block with the Ea running-mean (Welford) kernel.
+
+    Frame k updates mean += (frame - mean) / k, so acc_buf holds the mean
+    itself after the last frame: no partial sum grows past the data range
+    and there is no separate scale step. The result is a view of acc_buf,
+    overwritten by the next run.
+    """
+    n_frames = len(frames_block)
+    stride = frames_block.strides[0]
+    inv_k = [ctypes.c_float(1.0 / k) for k in range(1, n_frames + 1)]
+    update = lib.running_mean_f32x8
+    acc_buf.fill(0.0)
+
+    def stack_tile(acc_addr, frames_addr, count):
+        for k in range(n_frames):
+            update(acc_addr, frames_addr + k * stride, count, inv_k[k])
+
+    return _stack_ea_impl(frames_block, acc_buf, stack_tile)
+
+
+def quantize_q15(frames):
+    """Convert [0, 1] frames to contiguous Q0.15 uint16, once up front."""
+    return [np.rint(f * np.float32(Q15_ONE)).astype(np.uint16) for f in frames]
+
+
+def stack_ea_q15_run(lib, acc_i32, frames_q15):
+    """Stack Q0.15 frames (see quantize_q15) with the Ea int32 kernel.
+
+    Sums are exact; the only error is the 1/(2*Q15_ONE) quantization step.
+    Returns a new float32 array.
+    """
+    h, w = frames_q15[0].shape
+    n = h * w
+    acc_i32.fill(0)
+    acc_addr = acc_i32.ctypes.data
+    accumulate = lib.accumulate_q15_i32
+    for frame in frames_q15:
+        accumulate(acc_addr, frame.ctypes.data, n)
+    out = acc_i32.astype(np.float32)
+    out *= np.float32(1.0 / (len(frames_q15) * Q15_ONE))
+    return out.reshape(h, w)
 
 
 # ---------------------------------------------------------------------------
 # SNR measurement
 # ---------------------------------------------------------------------------
 
+if numba is not None:
+    @numba.njit(fastmath=True, cache=True)
+    def _snr_energies(image, reference):
+        """Sum of reference**2 and of (image - reference)**2, in one pass."""
+        signal = 0.0
+        noise = 0.0
+        for i in range(reference.size):
+            r = reference[i]
+            d = image[i] - r
+            signal += r * r
+            noise += d * d
+        return signal, noise
+
+
 def compute_snr(image, reference):
-    """Compute signal-to-noise ratio in dB."""
-    signal_power = np.mean(reference ** 2)
-    noise_power = np.mean((image - reference) ** 2)
-    if noise_power == 0:
+    """Compute signal-to-noise ratio in dB.
+
+    Both powers are means over the same pixel count, so the ratio of the
+    summed energies is used directly. With Numba the sums are fused into a
+    single pass with no temporaries; otherwise einsum avoids materializing
+    the squares.
+    """
+    if numba is not None:
+        signal, noise = _snr_energies(image.ravel(), reference.ravel())
+    else:
+        diff = image - reference
+        signal = np.einsum('ij,ij->', reference, reference, dtype=np.float64)
+        noise = np.einsum('ij,ij->', diff, diff, dtype=np.float64)
+    if noise == 0:
         return float('inf')
-    return 10 * np.log10(signal_power / noise_power)
+    return 10 * np.log10(signal / noise)
 
 
 # ---------------------------------------------------------------------------
@@ -417,9 +743,16 @@ def main():
     print()
 
     # --- Correctness ---
+    # One contiguous block for the Ea kernels (no copy when the frames
+    # already are one); frames become views into it
+    frames_block = frame_block(frames)
+    frames = list(frames_block)
+
     print("=== Correctness ===")
     result_numpy = stack_numpy(frames)
-    result_ea = stack_ea(frames, so_path)
+    lib, acc_buf = stack_ea_setup(so_path, h * w)
+    # Copied out: the benchmark runs below reuse acc_buf
+    result_ea = stack_ea_run(lib, acc_buf, frames_block).copy()
 
     diff = np.abs(result_ea - result_numpy)
     max_diff = diff.max()
@@ -429,6 +762,22 @@ def main():
         print("  Match: YES (within floating-point tolerance)")
     else:
         print(f"  Match: APPROXIMATE (max diff {max_diff:.6f})")
+
+    result_rm = stack_ea_running_mean_run(lib, acc_buf, frames_block)
+    rm_diff = np.abs(result_rm - result_numpy).max()
+    print(f"  Ea running mean vs NumPy: max diff = {rm_diff:.8f}")
+
+    frames_q15 = quantize_q15(frames)
+    acc_i32 = np.zeros(h * w, dtype=np.int32)
+    result_q15 = stack_ea_q15_run(lib, acc_i32, frames_q15)
+    q15_diff = np.abs(result_q15 - result_numpy).max()
+    print(f"  Ea Q15 vs NumPy: max diff = {q15_diff:.8f} "
+          f"(max rounding error {0.5 / Q15_ONE:.8f})")
+
+    gpu = has_gpu()
+    if gpu:
+        gpu_diff = np.abs(stack_cupy(frames_block) - result_numpy).max()
+        print(f"  CuPy vs NumPy: max diff = {gpu_diff:.8f}")
     print()
 
     # --- SNR Analysis ---
@@ -462,20 +811,36 @@ def main():
     t_numpy, s_numpy = benchmark(stack_numpy, frames)
     print(f"  NumPy               : {t_numpy:8.2f} ms  ±{s_numpy:.2f}")
 
-    t_ea, s_ea = benchmark(stack_ea, frames, so_path)
+    t_ea, s_ea = benchmark(stack_ea_run, lib, acc_buf, frames_block)
     print(f"  Ea f32x8 (SIMD)     : {t_ea:8.2f} ms  ±{s_ea:.2f}")
 
-    t_fe, s_fe = benchmark(stack_ea_foreach, frames, so_path)
+    t_fe, s_fe = benchmark(stack_ea_foreach_run, lib, acc_buf, frames_block)
     print(f"  Ea foreach (auto)   : {t_fe:8.2f} ms  ±{s_fe:.2f}")
+
+    t_rm, s_rm = benchmark(stack_ea_running_mean_run, lib, acc_buf, frames_block)
+    print(f"  Ea running mean     : {t_rm:8.2f} ms  ±{s_rm:.2f}")
+
+    t_q, s_q = benchmark(stack_ea_q15_run, lib, acc_i32, frames_q15)
+    print(f"  Ea Q15 (int32)      : {t_q:8.2f} ms  ±{s_q:.2f}")
+
+    if gpu:
+        t_gpu, s_gpu = benchmark(stack_cupy, frames_block)
+        print(f"  CuPy (GPU, w/ copy) : {t_gpu:8.2f} ms  ±{s_gpu:.2f}")
     print()
 
     # Memory note
     pixels = w * h
     print("=== Memory Usage ===")
+    print(f"  Input : (N, H, W) f32 block = "
+          f"{n_frames * pixels * 4 / 1024:.0f} KB, read in place by every path")
     print(f"  Ea    : O(pixels) extra = {pixels * 4 / 1024:.0f} KB "
           f"(single accumulator)")
-    print(f"  NumPy : O(N*pixels)     = {n_frames * pixels * 4 / 1024:.0f} KB "
-          f"(np.array stacks all frames)")
+    print(f"  Ea Q15: O(N*pixels) extra = {n_frames * pixels * 2 / 1024:.0f} KB "
+          f"(u16 frames) + {pixels * 4 / 1024:.0f} KB (i32 accumulator)")
+    print(f"  NumPy : O(pixels) extra = {pixels * 4 / 1024:.0f} KB "
+          f"(single accumulator)")
+    print(f"  np.mean(np.array(frames)) would copy the input again: "
+          f"O(N*pixels) = {n_frames * pixels * 4 / 1024:.0f} KB")
     print()
 
     # --- Summary ---
@@ -484,7 +849,6 @@ def main():
     print(f"  Ea vs NumPy  : {speedup:.1f}x "
           f"{'faster' if t_ea < t_numpy else 'slower'}")
     print(f"  SNR gain     : {snr_ea - snr_single:+.2f} dB from stacking {n_frames} frames")
-    print(f"  Memory       : Ea uses {n_frames}x less memory than NumPy")
     print()
     print("Output images saved to demo/astro_stack/")
 
@@ -2,43 +2,85 @@
 """
 Conv2D Demo: Eä vs NumPy — Quantized Inference Kernels
 
-Demonstrates maddubs (SSSE3 pmaddubsw): the SIMD instruction that powers
-int8 quantized inference in TFLite, ONNX Runtime, XNNPACK.
+Demonstrates the u8×i8 multiply-add instructions that power int8 quantized
+inference in TFLite, ONNX Runtime, XNNPACK.
 
-  dot_u8i8(act, wt, n)      — uint8 activations × int8 weights → i16 sum
-  conv1d_u8i8(src, wt, dst, n, k)  — sliding k-wide dot product
+  dot_u8i8(act, wt, n)      — uint8 activations × int8 weights → i32 sum (dpbusd)
+  conv1d_u8i8(src, wt, dst, n, k)  — sliding k-wide dot product (maddubs)
+  conv1d_u8i8_bias(src, wt, bias, dst, n, k)  — exact i32 conv (dpbusd) plus a
+      precomputed bias (int8 activations shifted to uint8, zero-point correction)
 
-NumPy computes in int32; Eä accumulates in i16x8 using maddubs.
-Keep activation values ≤ 10 and weight values ≤ 5 to avoid i16 overflow.
+NumPy forms u8 × i8 products in int16 and sums them in int32. dot_u8i8
+accumulates straight into i32x4 with dpbusd (VNNI vpdpbusd on x86,
+usdot/udot on Arm), so it is exact over the full u8 × i8 range.
+conv1d_u8i8 accumulates in i16x8 using maddubs; keep its values small to
+avoid i16 overflow.
+
+When Numba is installed, conv1d is also timed as a compiled njit loop
+(conv1d_numba) so Eä is compared against native code, not the interpreter.
 
 Usage:
-    python run.py
+    python run.py             # correctness + timing
+    python run.py --profile   # also cycles / instructions / branch misses per call
 """
 
+import os
 import sys
 import time
+import hashlib
+import platform
 import ctypes
 import subprocess
+from itertools import repeat
 from pathlib import Path
 import numpy as np
 
+# Make demo_common importable
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from demo_common import dot_isa
+
+try:
+    import numba
+except ImportError:
+    numba = None  # conv1d_numba falls back to the Python-loop reference
+
 DEMO_DIR = Path(__file__).parent
 EA_ROOT  = DEMO_DIR / ".." / ".."
 
-U8PTR  = ctypes.POINTER(ctypes.c_uint8)
-I8PTR  = ctypes.POINTER(ctypes.c_int8)
-I16PTR = ctypes.POINTER(ctypes.c_int16)
+# Pointer args are declared c_void_p and passed as raw addresses
+# (arr.ctypes.data), so a call skips the POINTER object data_as() builds.
+PTR = ctypes.c_void_p
 
 
 # ---------------------------------------------------------------------------
 # Build
 # ---------------------------------------------------------------------------
 
+def _build_digest(ea_path):
+    """Cache key for the built .so: the .ea contents plus the compiler binary.
+
+    The binary is identified by size and mtime, so a rebuilt compiler (which
+    may lower the same source differently) invalidates the cached .so.
+    """
+    compiler = EA_ROOT / "target" / "release" / "ea"
+    stamp = b""
+    if compiler.exists():
+        st = compiler.stat()
+        stamp = f"{st.st_size}:{st.st_mtime_ns}".encode()
+    return hashlib.blake2b(ea_path.read_bytes() + stamp, digest_size=16).hexdigest()
+
+
 def build_conv():
     so_path = DEMO_DIR / "conv.so"
     ea_path = DEMO_DIR / "conv.ea"
 
-    if so_path.exists() and so_path.stat().st_mtime > ea_path.stat().st_mtime:
+    # Key the cached .so on the source contents, not mtimes: a checkout that
+    # touches conv.ea without changing it does not force a rebuild, while a
+    # rebuilt compiler does (see _build_digest).
+    hash_path = so_path.with_suffix(".so.hash")
+    src_hash = _build_digest(ea_path)
+    if (so_path.exists() and hash_path.exists()
+            and hash_path.read_text() == src_hash):
         return so_path
 
     print("Building Eä kernel (conv)...")
@@ -54,6 +96,8 @@ def build_conv():
     built = EA_ROOT / "conv.so"
     if built.exists():
         built.rename(so_path)
+    # cargo run may just have rebuilt the compiler: key on the one used
+    hash_path.write_text(_build_digest(ea_path))
 
     print(f"  Built: {so_path}")
     return so_path
@@ -62,12 +106,16 @@ def build_conv():
 def load_lib(so_path):
     lib = ctypes.CDLL(str(so_path))
 
-    lib.dot_u8i8.argtypes  = [U8PTR, I8PTR, ctypes.c_int32]
-    lib.dot_u8i8.restype   = ctypes.c_int16
+    lib.dot_u8i8.argtypes  = [PTR, PTR, ctypes.c_int32]
+    lib.dot_u8i8.restype   = ctypes.c_int32
 
-    lib.conv1d_u8i8.argtypes = [U8PTR, I8PTR, I16PTR, ctypes.c_int32, ctypes.c_int32]
+    lib.conv1d_u8i8.argtypes = [PTR, PTR, PTR, ctypes.c_int32, ctypes.c_int32]
     lib.conv1d_u8i8.restype  = None
 
+    lib.conv1d_u8i8_bias.argtypes = [PTR, PTR, ctypes.c_int32, PTR,
+                                     ctypes.c_int32, ctypes.c_int32]
+    lib.conv1d_u8i8_bias.restype  = None
+
     return lib
 
 
@@ -75,22 +123,37 @@ def load_lib(so_path):
 # Dot product
 # ---------------------------------------------------------------------------
 
-N_DOT = 512       # kept small so i16 accumulator doesn't overflow
-N_BENCH = 65536   # for timing only — values chosen to avoid overflow too
+N_DOT = 512
+N_BENCH = 65536
+
+
+# |u8 * i8| <= 255 * 128 = 32640 fits int16, and 65536 such products sum
+# to at most 2,139,095,040 < 2**31, so an int32 sum over a block is exact.
+DOT_I32_BLOCK = 65536
 
 
 def dot_numpy(act, wt):
-    return int(np.dot(act.astype(np.int32), wt.astype(np.int32)))
+    # Products straight into int16 (half the bytes of the old int32 copies),
+    # then one int32 reduction per block.
+    prod = np.multiply(act, wt, dtype=np.int16)
+    return sum(int(prod[i:i + DOT_I32_BLOCK].sum(dtype=np.int32))
+               for i in range(0, len(prod), DOT_I32_BLOCK))
 
 
-def dot_ea(lib, act, wt):
+def dot_ea_args(act, wt):
+    """Contiguous buffers and the raw (act, wt, n) arguments for dot_u8i8.
+
+    Done once outside the timed loop, so benchmarks time the kernel call and
+    not the conversion. The buffers must be kept alive while args are used.
+    """
     act_c = np.ascontiguousarray(act, dtype=np.uint8)
     wt_c  = np.ascontiguousarray(wt, dtype=np.int8)
-    return int(lib.dot_u8i8(
-        act_c.ctypes.data_as(U8PTR),
-        wt_c.ctypes.data_as(I8PTR),
-        ctypes.c_int32(len(act_c)),
-    ))
+    return (act_c, wt_c), (act_c.ctypes.data, wt_c.ctypes.data, len(act_c))
+
+
+def dot_ea(lib, act, wt):
+    _, args = dot_ea_args(act, wt)
+    return int(lib.dot_u8i8(*args))
 
 
 # ---------------------------------------------------------------------------
@@ -111,6 +174,30 @@ def conv1d_numpy(src, wt, n, k):
     return out
 
 
+if numba is not None:
+    @numba.njit(parallel=True, fastmath=True, cache=True)
+    def _conv1d_numba_kernel(src, wt, dst, n, k):
+        for j in numba.prange(n):
+            acc = np.int32(0)
+            for t in range(k):
+                acc += np.int32(src[j + t]) * np.int32(wt[t])
+            dst[j] = acc  # wraps to i16 like the Eä accumulator
+
+
+def conv1d_numba(src, wt, n, k):
+    """Compiled loop over uint8/int8 inputs with an i16 result.
+
+    The k-wide inner loop is the u8*i8 multiply-add pattern LLVM lowers to
+    pmaddubsw-style code; rows run in parallel. Without Numba this is the
+    (slow) Python-loop reference.
+    """
+    if numba is None:
+        return conv1d_numpy(src, wt, n, k).astype(np.int16)
+    dst = np.empty(n, dtype=np.int16)
+    _conv1d_numba_kernel(src, wt, dst, n, k)
+    return dst
+
+
 def conv1d_numpy_fast(src, wt, n, k):
     # Vectorised version using stride tricks
     src32 = src[:n + k - 1].astype(np.int32)
@@ -121,43 +208,162 @@ def conv1d_numpy_fast(src, wt, n, k):
     return windows @ wt32
 
 
-def conv1d_ea(lib, src, wt, n, k):
+# int8 activations enter dpbusd as uint8 by adding this zero point.
+ACT_ZERO_POINT = 128
+
+
+def prep_weights(wt, act_zero_point=ACT_ZERO_POINT):
+    """Weights plus the bias that undoes the activation zero-point shift.
+
+    With a_u8 = a_i8 + zp:  sum(a_u8 * w) - zp * sum(w) == sum(a_i8 * w),
+    so bias = -zp * sum(w) is computed once per weight set instead of per
+    output.
+    """
+    wt_c = np.ascontiguousarray(wt, dtype=np.int8)
+    bias = -act_zero_point * int(wt_c.astype(np.int32).sum())
+    return wt_c, bias
+
+
+def shift_activations(src_i8):
+    """int8 activations to uint8 with zero point 128 (flips the sign bit)."""
+    return src_i8.view(np.uint8) ^ np.uint8(0x80)
+
+
+def conv1d_ea_args(src, wt, n, k, dst=None):
+    """Buffers (src, wt, dst) and raw arguments for conv1d_u8i8, built once.
+
+    dst, if given, must be a C-contiguous int16 array of n elements; otherwise
+    one is allocated uninitialised, since the kernel writes every output.
+    """
     src_c = np.ascontiguousarray(src, dtype=np.uint8)
     wt_c  = np.ascontiguousarray(wt, dtype=np.int8)
-    dst   = np.zeros(n, dtype=np.int16)
-    lib.conv1d_u8i8(
-        src_c.ctypes.data_as(U8PTR),
-        wt_c.ctypes.data_as(I8PTR),
-        dst.ctypes.data_as(I16PTR),
-        ctypes.c_int32(n),
-        ctypes.c_int32(k),
-    )
-    return dst
+    if dst is None:
+        dst = np.empty(n, dtype=np.int16)
+    elif dst.dtype != np.int16 or dst.size != n or not dst.flags["C_CONTIGUOUS"]:
+        raise ValueError("dst must be a C-contiguous int16 array of n elements")
+    return (src_c, wt_c, dst), (src_c.ctypes.data, wt_c.ctypes.data, dst.ctypes.data, n, k)
+
+
+def conv1d_ea(lib, src, wt, n, k, dst=None):
+    bufs, args = conv1d_ea_args(src, wt, n, k, dst)
+    lib.conv1d_u8i8(*args)
+    return bufs[2]
 
 
 # ---------------------------------------------------------------------------
 # Benchmark
 # ---------------------------------------------------------------------------
 
-def benchmark(func, *args, warmup=5, runs=50):
+def benchmark(func, *args, warmup=5, runs=50, min_batch_ns=1_000_000):
+    """Median and std of per-call time in ms.
+
+    Calls are timed in batches long enough (>= 1 ms) that clock-read
+    overhead is amortised for microsecond kernels, as timeit does.
+    """
     for _ in range(warmup):
         func(*args)
+    batch = 1
+    while True:
+        t0 = time.perf_counter_ns()
+        for _ in repeat(None, batch):
+            func(*args)
+        if time.perf_counter_ns() - t0 >= min_batch_ns:
+            break
+        batch *= 2
     times = []
     for _ in range(runs):
-        t0 = time.perf_counter()
-        func(*args)
-        t1 = time.perf_counter()
-        times.append((t1 - t0) * 1000)
+        t0 = time.perf_counter_ns()
+        for _ in repeat(None, batch):
+            func(*args)
+        t1 = time.perf_counter_ns()
+        times.append((t1 - t0) / batch / 1e6)
     times.sort()
     return times[len(times) // 2], float(np.std(times))
 
 
+# ---------------------------------------------------------------------------
+# Hardware counters (--profile, Linux only)
+# ---------------------------------------------------------------------------
+
+class PerfEventAttr(ctypes.Structure):
+    # PERF_ATTR_SIZE_VER0 layout of struct perf_event_attr (64 bytes).
+    _fields_ = [
+        ("type", ctypes.c_uint32),
+        ("size", ctypes.c_uint32),
+        ("config", ctypes.c_uint64),
+        ("sample_period", ctypes.c_uint64),
+        ("sample_type", ctypes.c_uint64),
+        ("read_format", ctypes.c_uint64),
+        ("flags", ctypes.c_uint64),
+        ("wakeup_events", ctypes.c_uint32),
+        ("bp_type", ctypes.c_uint32),
+        ("config1", ctypes.c_uint64),
+    ]
+
+
+PERF_TYPE_HARDWARE = 0
+PERF_EVENTS = {"cycles": 0, "instructions": 1, "branch-misses": 5}
+NR_PERF_EVENT_OPEN = {"x86_64": 298, "aarch64": 241}
+EXCLUDE_KERNEL_HV = (1 << 5) | (1 << 6)  # user-space only: works at paranoid=2
+
+
+def perf_open(event):
+    """Counter fd for this thread on any CPU, or None if unavailable."""
+    nr = NR_PERF_EVENT_OPEN.get(platform.machine())
+    if nr is None:
+        return None
+    attr = PerfEventAttr(type=PERF_TYPE_HARDWARE, size=ctypes.sizeof(PerfEventAttr),
+                         config=PERF_EVENTS[event], flags=EXCLUDE_KERNEL_HV)
+    libc = ctypes.CDLL(None, use_errno=True)
+    fd = libc.syscall(nr, ctypes.byref(attr), 0, -1, -1, 0)
+    return fd if fd >= 0 else None
+
+
+def perf_bench(func, *args, events=("cycles", "instructions", "branch-misses"),
+               runs=1000):
+    """Per-call hardware counts for func(*args), or None without perf access.
+
+    Counts include the Python/ctypes call path, which is what separates
+    FFI dispatch cost from kernel work on small inputs.
+    """
+    fds = {e: perf_open(e) for e in events}
+    if any(fd is None for fd in fds.values()):
+        for fd in fds.values():
+            if fd is not None:
+                os.close(fd)
+        return None
+    read = lambda fd: int.from_bytes(os.read(fd, 8), "little")
+    try:
+        for _ in range(5):
+            func(*args)
+        before = {e: read(fd) for e, fd in fds.items()}
+        for _ in repeat(None, runs):
+            func(*args)
+        after = {e: read(fd) for e, fd in fds.items()}
+    finally:
+        for fd in fds.values():
+            os.close(fd)
+    return {e: (after[e] - before[e]) / runs for e in events}
+
+
+def print_profile(label, counts):
+    if counts is None:
+        print(f"  {label:<22}: counters unavailable "
+              f"(check /proc/sys/kernel/perf_event_paranoid)")
+        return
+    ipc = counts["instructions"] / counts["cycles"] if counts["cycles"] else 0.0
+    print(f"  {label:<22}: {counts['cycles']:10.0f} cycles  "
+          f"{counts['instructions']:10.0f} instr  IPC {ipc:4.2f}  "
+          f"{counts['branch-misses']:6.1f} br-miss  /call")
+
+
 # ---------------------------------------------------------------------------
 # Main
 # ---------------------------------------------------------------------------
 
 def main():
-    print("Quantized Inference Kernels: uint8 × int8 (SSSE3 pmaddubsw)")
+    print("Quantized Inference Kernels: uint8 × int8 (VNNI vpdpbusd, SSSE3 pmaddubsw)")
+    print(f"  dpbusd lowers to: {dot_isa()}")
     print()
 
     so_path = build_conv()
@@ -168,15 +374,16 @@ def main():
 
     # ==========================================================================
     print("=" * 62)
-    print("  KERNEL 1: dot_u8i8 — dot product (n=512, act∈[0,10], wt∈[-5,5])")
+    print("  KERNEL 1: dot_u8i8 — dot product (n=512, act∈[0,255], wt∈[-128,127])")
     print("=" * 62)
     print()
-    print("  Eä:   maddubs_i16(u8x16, i8x16) → i16x8, reduce_add → i16")
-    print("  NumPy: np.dot(act.astype(int32), wt.astype(int32))")
+    print("  Eä:   dpbusd(i32x4, u8x16, i8x16) → i32x4, reduce_add → i32")
+    print("  NumPy: np.multiply(act, wt, dtype=int16).sum(dtype=int32)")
     print()
 
-    act_small = rng.randint(0, 11, N_DOT).astype(np.uint8)
-    wt_small  = rng.randint(-5, 6, N_DOT).astype(np.int8)
+    # Full range: 255 × 127 pairs saturate pmaddubsw's i16, but not dpbusd.
+    act_small = rng.randint(0, 256, N_DOT).astype(np.uint8)
+    wt_small  = rng.randint(-128, 128, N_DOT).astype(np.int8)
 
     ref_dot = dot_numpy(act_small, wt_small)
     ea_dot  = dot_ea(lib, act_small, wt_small)
@@ -185,16 +392,16 @@ def main():
           f"{'PASS — exact match' if match else 'FAIL'}")
     print()
 
-    # Performance on larger array (still no overflow with values ≤ 5)
-    act_bench = rng.randint(0, 3, N_BENCH).astype(np.uint8)
-    wt_bench  = rng.randint(-2, 3, N_BENCH).astype(np.int8)
+    act_bench = rng.randint(0, 256, N_BENCH).astype(np.uint8)
+    wt_bench  = rng.randint(-128, 128, N_BENCH).astype(np.int8)
 
     print(f"  Performance: n={N_BENCH:,} elements, 50 runs")
     t_np, s_np = benchmark(dot_numpy, act_bench, wt_bench)
-    t_ea, s_ea = benchmark(dot_ea, lib, act_bench, wt_bench)
+    _dot_bufs, dot_args = dot_ea_args(act_bench, wt_bench)
+    t_ea, s_ea = benchmark(lib.dot_u8i8, *dot_args)
     tag = f"{t_np/t_ea:.2f}x faster" if t_ea < t_np else f"{t_ea/t_np:.2f}x slower"
-    print(f"  NumPy (int32): {t_np:7.3f} ms  ±{s_np:.3f}")
-    print(f"  Eä (maddubs) : {t_ea:7.3f} ms  ±{s_ea:.3f}")
+    print(f"  NumPy (int16): {t_np:7.3f} ms  ±{s_np:.3f}")
+    print(f"  Eä (dpbusd)  : {t_ea:7.3f} ms  ±{s_ea:.3f}")
     print(f"  Eä vs NumPy  : {tag}")
     print()
 
@@ -210,24 +417,72 @@ def main():
     src_conv = rng.randint(0, 3, N_CONV + K - 1).astype(np.uint8)
     wt_conv  = rng.randint(-2, 3, K).astype(np.int8)
 
+    # One output buffer, allocated once and reused by the check and the timing
+    dst_conv = np.empty(N_CONV, dtype=np.int16)
     ref_conv = conv1d_numpy_fast(src_conv, wt_conv, N_CONV, K).astype(np.int16)
-    ea_conv  = conv1d_ea(lib, src_conv, wt_conv, N_CONV, K)
+    ea_conv  = conv1d_ea(lib, src_conv, wt_conv, N_CONV, K, dst_conv)
     close    = np.array_equal(ref_conv, ea_conv)
     print(f"  Correctness: all {N_CONV} outputs match: {'PASS' if close else 'FAIL'}")
     if not close:
         diff_idx = np.where(ref_conv != ea_conv)[0]
         print(f"    First mismatch at index {diff_idx[0]}: "
               f"NumPy={ref_conv[diff_idx[0]]}  Eä={ea_conv[diff_idx[0]]}")
+    nb_label = "Numba (njit)  " if numba is not None else "Python loop   "
+    nb_conv = conv1d_numba(src_conv, wt_conv, N_CONV, K)
+    nb_ok = np.array_equal(ref_conv, nb_conv)
+    print(f"  {nb_label.strip()} reference: {'PASS' if nb_ok else 'FAIL'}")
     print()
 
     t_np2, s_np2 = benchmark(conv1d_numpy_fast, src_conv, wt_conv, N_CONV, K)
-    t_ea2, s_ea2 = benchmark(conv1d_ea, lib, src_conv, wt_conv, N_CONV, K)
+    _conv_bufs, conv_args = conv1d_ea_args(src_conv, wt_conv, N_CONV, K, dst_conv)
+    t_ea2, s_ea2 = benchmark(lib.conv1d_u8i8, *conv_args)
+    t_nb2, s_nb2 = benchmark(conv1d_numba, src_conv, wt_conv, N_CONV, K)
     tag2 = f"{t_np2/t_ea2:.2f}x faster" if t_ea2 < t_np2 else f"{t_ea2/t_np2:.2f}x slower"
     print(f"  NumPy (stride): {t_np2:7.3f} ms  ±{s_np2:.3f}")
+    print(f"  {nb_label}: {t_nb2:7.3f} ms  ±{s_nb2:.3f}")
     print(f"  Eä (maddubs)  : {t_ea2:7.3f} ms  ±{s_ea2:.3f}")
     print(f"  Eä vs NumPy   : {tag2}")
     print()
 
+    # ==========================================================================
+    print("=" * 62)
+    print(f"  KERNEL 3: conv1d_u8i8_bias — int8 activations (n={N_CONV}, k={K})")
+    print("=" * 62)
+    print()
+    print(f"  Weight prep: bias = -{ACT_ZERO_POINT} * sum(wt), once per weight set")
+    print(f"  Eä: dpbusd on (act + {ACT_ZERO_POINT}) as u8 into i32, + bias per output")
+    print()
+
+    def check_bias(src_s8, wt_s8):
+        wt_b, bias = prep_weights(wt_s8)
+        src_b = shift_activations(src_s8)
+        dst_b = np.empty(N_CONV, dtype=np.int32)
+        args = (src_b.ctypes.data, wt_b.ctypes.data, bias,
+                dst_b.ctypes.data, N_CONV, K)
+        lib.conv1d_u8i8_bias(*args)
+        ok = np.array_equal(conv1d_numpy_fast(src_s8, wt_s8, N_CONV, K), dst_b)
+        return ok, (src_b, wt_b, dst_b), args
+
+    src_s8 = rng.randint(-3, 4, N_CONV + K - 1).astype(np.int8)
+    ok_b, _bias_bufs, bias_args = check_bias(src_s8, wt_conv)
+    print(f"  Correctness (small range): all {N_CONV} outputs match: "
+          f"{'PASS' if ok_b else 'FAIL'}")
+    # Full int8 range: shifted pairs like 255*127*2 would saturate maddubs.
+    src_full = rng.randint(-128, 128, N_CONV + K - 1).astype(np.int8)
+    wt_full  = rng.randint(-128, 128, K).astype(np.int8)
+    ok_full, _, _ = check_bias(src_full, wt_full)
+    print(f"  Correctness (full int8) : all {N_CONV} outputs match: "
+          f"{'PASS' if ok_full else 'FAIL'}")
+    print()
+
+    t_np3, s_np3 = benchmark(conv1d_numpy_fast, src_s8, wt_conv, N_CONV, K)
+    t_ea3, s_ea3 = benchmark(lib.conv1d_u8i8_bias, *bias_args)
+    tag3 = f"{t_np3/t_ea3:.2f}x faster" if t_ea3 < t_np3 else f"{t_ea3/t_np3:.2f}x slower"
+    print(f"  NumPy (stride): {t_np3:7.3f} ms  ±{s_np3:.3f}")
+    print(f"  Eä (bias)     : {t_ea3:7.3f} ms  ±{s_ea3:.3f}")
+    print(f"  Eä vs NumPy   : {tag3}")
+    print()
+
     # ==========================================================================
     print("=" * 62)
     print("  SUMMARY")
@@ -235,10 +490,23 @@ def main():
     print()
     print(f"  dot_u8i8  : Eä {t_ea:.3f} ms  NumPy {t_np:.3f} ms  → {tag}")
     print(f"  conv1d    : Eä {t_ea2:.3f} ms  NumPy {t_np2:.3f} ms  → {tag2}")
+    print(f"  bias conv : Eä {t_ea3:.3f} ms  NumPy {t_np3:.3f} ms  → {tag3}")
     print()
-    print(f"  Instruction: SSSE3 pmaddubsw (maddubs) — 1 cycle throughput")
+    print(f"  Instructions: {dot_isa()} (dot, conv1d bias), SSSE3 pmaddubsw (conv1d)")
     print(f"  New in v0.3.0: i16x8, i16x16 vectors + maddubs_i16(u8x16, i8x16) → i16x8")
 
+    if "--profile" in sys.argv[1:]:
+        print()
+        print("=" * 62)
+        print("  PROFILE: per-call hardware counters (user space)")
+        print("=" * 62)
+        print()
+        _small_bufs, small_args = dot_ea_args(act_small, wt_small)
+        print_profile(f"Eä dot n={N_DOT}", perf_bench(lib.dot_u8i8, *small_args))
+        print_profile(f"NumPy dot n={N_DOT}", perf_bench(dot_numpy, act_small, wt_small))
+        print_profile(f"Eä dot n={N_BENCH:,}", perf_bench(lib.dot_u8i8, *dot_args, runs=50))
+        print_profile(f"NumPy dot n={N_BENCH:,}", perf_bench(dot_numpy, act_bench, wt_bench, runs=50))
+
 
 if __name__ == "__main__":
     main()
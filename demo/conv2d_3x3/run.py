@@ -4,11 +4,29 @@ Input: (H+2) x (W+2) x C_in padded uint8 image
 Kernel: 3x3 x C_in int8 weights
 Output: H x W int16 accumulation
 
+Baselines: per-tap GEMM reference, im2col + BLAS sgemm (whole image and row-tiled),
+batched FFT, SciPy's native N-d correlation when SciPy is installed, and a
+Numba direct loop when Numba is installed.
+
 C_in must be a multiple of 32 (dual-accumulator kernel).
 """
-import ctypes, os, subprocess, tempfile, time
+import contextlib, ctypes, gc, hashlib, os, subprocess, sys, tempfile, time
 import numpy as np
 
+# Make demo_common importable
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from demo_common import dot_isa
+
+try:
+    from scipy import signal
+except ImportError:
+    signal = None  # the SciPy baseline is skipped
+
+try:
+    import numba
+except ImportError:
+    numba = None  # the Numba baseline is skipped
+
 HERE = os.path.dirname(os.path.abspath(__file__))
 EA_SRC = os.path.join(HERE, "conv.ea")
 SO_PATH = os.path.join(HERE, "conv.so")
@@ -16,102 +34,373 @@ EA_BIN = os.path.join(HERE, "../../target/release/ea")
 if not os.path.exists(EA_BIN):
     EA_BIN = os.path.join(HERE, "../../target/debug/ea")
 
-# --- compile ---
-print("Compiling conv.ea ...", flush=True)
-subprocess.run(
-    [EA_BIN, EA_SRC, "--lib", "-o", SO_PATH],
-    check=True, capture_output=True
-)
+# --- compile (skipped when conv.ea and the compiler are unchanged since the
+# last build; the compiler binary is keyed on size and mtime, so a rebuilt
+# compiler that may lower conv.ea differently forces a recompile) ---
+HASH_PATH = SO_PATH + ".hash"
+with open(EA_SRC, "rb") as f:
+    src_bytes = f.read()
+if os.path.exists(EA_BIN):
+    st = os.stat(EA_BIN)
+    src_bytes += f"{st.st_size}:{st.st_mtime_ns}".encode()
+src_hash = hashlib.blake2b(src_bytes, digest_size=16).hexdigest()
+cached = False
+if os.path.exists(SO_PATH) and os.path.exists(HASH_PATH):
+    with open(HASH_PATH) as f:
+        cached = f.read() == src_hash
+if not cached:
+    print("Compiling conv.ea ...", flush=True)
+    subprocess.run(
+        [EA_BIN, EA_SRC, "--lib", "-o", SO_PATH],
+        check=True, capture_output=True
+    )
+    with open(HASH_PATH, "w") as f:
+        f.write(src_hash)
 lib = ctypes.CDLL(SO_PATH)
 lib.conv2d_3x3_u8i8.argtypes = [
-    ctypes.c_char_p,   # src  *u8
-    ctypes.c_char_p,   # wt   *i8
-    ctypes.c_char_p,   # dst  *mut i16
+    ctypes.c_void_p,   # src  *u8       (ndarray address)
+    ctypes.c_void_p,   # wt   *i8       (ndarray address)
+    ctypes.c_void_p,   # dst  *mut i16  (ndarray address)
     ctypes.c_int,      # H
     ctypes.c_int,      # W
     ctypes.c_int,      # C_in
 ]
 lib.conv2d_3x3_u8i8.restype = None
+lib.conv2d_3x3_u8i8_vnni.argtypes = [
+    ctypes.c_void_p,   # src  *u8       (ndarray address)
+    ctypes.c_void_p,   # wt   *i8       (ndarray address)
+    ctypes.c_void_p,   # dst  *mut i32  (ndarray address)
+    ctypes.c_int,      # H
+    ctypes.c_int,      # W
+    ctypes.c_int,      # C_in
+]
+lib.conv2d_3x3_u8i8_vnni.restype = None
+lib.conv2d_3x3_u8i8_batch.argtypes = [
+    ctypes.c_void_p,   # src  *u8       (all padded inputs, back to back)
+    ctypes.c_void_p,   # wt   *i8       (shared weights)
+    ctypes.c_void_p,   # dst  *mut i16  (all outputs, back to back)
+    ctypes.c_void_p,   # desc *i32      (n x [H, W, src_off, dst_off])
+    ctypes.c_int,      # n
+    ctypes.c_int,      # C_in
+]
+lib.conv2d_3x3_u8i8_batch.restype = None
 
 # --- problem size ---
 H, W, C_in = 56, 56, 64   # typical first conv layer output spatial
 assert C_in % 32 == 0, "C_in must be multiple of 32"
 
-# padded input: (H+2) x (W+2) x C_in
-src_np = np.random.randint(0, 128, ((H+2)*(W+2)*C_in,), dtype=np.uint8)
-wt_np  = np.random.randint(-64, 64, (9*C_in,), dtype=np.int8)
+# padded input: (H+2) x (W+2) x C_in, seeded and cached on disk so every
+# run times the same bytes and skips the RNG.
+DATA_PATH = os.path.join(HERE, "conv_data.npz")
+
+def load_data():
+    if os.path.exists(DATA_PATH):
+        with np.load(DATA_PATH) as data:
+            if tuple(data["shape"]) == (H, W, C_in):
+                return data["src"], data["wt"]
+    rng = np.random.RandomState(42)
+    src = rng.randint(0, 128, ((H+2)*(W+2)*C_in,)).astype(np.uint8)
+    wt  = rng.randint(-64, 64, (9*C_in,)).astype(np.int8)
+    np.savez(DATA_PATH, shape=np.array([H, W, C_in]), src=src, wt=wt)
+    return src, wt
+
+# Copy into fresh contiguous arrays; the copy also faults in every page
+# before timing starts.
+src_np, wt_np = (np.array(a, order="C") for a in load_data())
 dst_ea = np.zeros(H * W, dtype=np.int16)
 
-src_c = src_np.tobytes()
-wt_c  = wt_np.tobytes()
-dst_c = ctypes.create_string_buffer(dst_ea.nbytes)
+# Persistent buffers: the kernel reads/writes the ndarrays in place, so no
+# bytes copy or c_char_p conversion happens per call. Raw addresses are only
+# valid for C-contiguous arrays, which order="C" and np.zeros guarantee above.
+src_c = src_np.ctypes.data
+wt_c  = wt_np.ctypes.data
+dst_c = dst_ea.ctypes.data
 
 # --- numpy reference ---
 def conv_numpy(src_flat, wt_flat, H, W, C_in):
-    stride = (W + 2) * C_in
-    src = src_flat.astype(np.int32).reshape((H+2)*(W+2), C_in)
-    wt  = wt_flat.astype(np.int32).reshape(9, C_in)
-    out = np.zeros((H, W), dtype=np.int32)
+    return conv_numpy_i32(src_flat, wt_flat, H, W, C_in).astype(np.int16)
+
+def conv_numpy_i32(src_flat, wt_flat, H, W, C_in):
+    # One GEMM of every padded pixel against all 9 taps, (H+2)*(W+2) x C_in
+    # times C_in x 9, then 9 shifted slice adds. The input is read once,
+    # with no 9x im2col temporary. A single tap's dot product is at most
+    # 255 * 128 * C_in; below 2**24 float32 (BLAS sgemm) is exact, otherwise
+    # the GEMM runs in int64.
+    exact_f32 = 255 * 128 * C_in < 2**24
+    dt = np.float32 if exact_f32 else np.int64
+    src2 = src_flat.reshape((H+2) * (W+2), C_in).astype(dt)
+    taps = (src2 @ wt_flat.reshape(9, C_in).T.astype(dt)).astype(np.int32)
+    taps = taps.reshape(H+2, W+2, 9)
+    acc = np.zeros((H, W), dtype=np.int32)
     for dr in range(3):
         for dc in range(3):
-            # src rows for this (dr,dc) offset: rows [dr..dr+H], cols [dc..dc+W]
-            src_patch = src[(np.arange(H)[:,None]+dr)*(W+2) + (np.arange(W)[None,:]+dc)]  # H×W×C
-            # wait, simpler:
-            rows = np.arange(H)
-            cols = np.arange(W)
-            # src_off = (row+dr)*(W+2)*C_in + (col+dc)*C_in
-            # flatten manually
-            pass
-    # Simpler: reshape src to (H+2, W+2, C_in)
+            acc += taps[dr:dr+H, dc:dc+W, dr*3 + dc]
+    return acc
+
+def gemm_dtype(wt_flat, C_in):
+    # A full 3x3 window sums 9*C_in products of at most 255 * max|wt|. Below
+    # 2**24 every partial sum is exact in float32 (sgemm); otherwise fall back
+    # to float64 (dgemm, exact to 2**53). Only the 9*C_in weights are scanned:
+    # the demo's |wt| <= 64 keeps C_in = 64 in float32 for any u8 input, while
+    # full-range int8 weights need float64 from C_in = 58.
+    wt_max = int(np.abs(wt_flat.astype(np.int16)).max())
+    return np.float32 if 9 * C_in * 255 * wt_max < 2**24 else np.float64
+
+def conv_gemm(src_flat, wt_flat, H, W, C_in):
+    # im2col + one BLAS sgemm call: the usual optimised-C conv baseline.
+    dt = gemm_dtype(wt_flat, C_in)
+    src3 = src_flat.reshape(H+2, W+2, C_in)
+    cols = np.lib.stride_tricks.sliding_window_view(src3, (3, 3, C_in))[:, :, 0]
+    w_mat = wt_flat.reshape(9*C_in, 1).astype(dt)
+    acc = cols.reshape(H*W, 9*C_in).astype(dt) @ w_mat
+    return acc.reshape(H, W).astype(np.int32).astype(np.int16)
+
+GEMM_TILE_ROWS = 8
+
+def conv_gemm_tiled(src_flat, wt_flat, H, W, C_in, tile=GEMM_TILE_ROWS):
+    # Same sgemm, fed a few output rows at a time so the float32 im2col
+    # temporary stays tile*W*9*C_in instead of H*W*9*C_in.
+    dt = gemm_dtype(wt_flat, C_in)
+    src3 = src_flat.reshape(H+2, W+2, C_in)
+    cols = np.lib.stride_tricks.sliding_window_view(src3, (3, 3, C_in))[:, :, 0]
+    w_mat = wt_flat.reshape(9*C_in, 1).astype(dt)
+    out = np.empty((H, W), dtype=np.int16)
+    for h0 in range(0, H, tile):
+        block = cols[h0:h0+tile].reshape(-1, 9*C_in).astype(dt)
+        out[h0:h0+tile] = (block @ w_mat).reshape(-1, W).astype(np.int32)
+    return out
+
+def conv_scipy(src_flat, wt_flat, H, W, C_in):
+    # One native call: a 'valid' N-d correlation of the (H+2, W+2, C_in) input
+    # with the (3, 3, C_in) kernel has output shape (H, W, 1), i.e. exactly the
+    # per-pixel sum over the 3x3 window and every channel.
     src3 = src_flat.astype(np.int32).reshape(H+2, W+2, C_in)
     wt3  = wt_flat.astype(np.int32).reshape(3, 3, C_in)
-    acc  = np.zeros((H, W), dtype=np.int32)
-    for dr in range(3):
-        for dc in range(3):
-            acc += (src3[dr:dr+H, dc:dc+W, :] * wt3[dr, dc, :]).sum(axis=-1)
+    acc = signal.correlate(src3, wt3, mode="valid", method="direct")
+    return acc.reshape(H, W).astype(np.int16)
+
+if numba is not None:
+    @numba.njit(parallel=True, cache=True)
+    def _conv_numba_kernel(src, wt, dst, H, W, C_in):
+        # Same loop nest as the Eä kernel: output rows in parallel, the
+        # 3x3xC_in reduction for one pixel kept in a register. The three
+        # taps of a kernel row are 3*C_in contiguous bytes in both src and
+        # wt, so each becomes one flat loop that LLVM can vectorise.
+        stride = (W + 2) * C_in
+        for row in numba.prange(H):
+            for col in range(W):
+                acc = np.int32(0)
+                for dr in range(3):
+                    s0 = (row + dr) * stride + col * C_in
+                    a = src[s0:s0 + 3 * C_in]
+                    b = wt[dr * 3 * C_in:(dr + 1) * 3 * C_in]
+                    for ci in range(3 * C_in):
+                        acc += np.int32(a[ci]) * np.int32(b[ci])
+                dst[row * W + col] = acc
+
+def conv_numba(src_flat, wt_flat, H, W, C_in, dtype=np.int16):
+    # dtype=int16 stores the exact i32 sum wrapped to 16 bits, which is what
+    # an i16 accumulator gives (wrapping adds are modular). int32 is exact.
+    dst = np.empty(H * W, dtype=dtype)
+    _conv_numba_kernel(src_flat, wt_flat, dst, H, W, C_in)
+    return dst.reshape(H, W)
+
+def conv_fft(src_flat, wt_flat, H, W, C_in):
+    # One batched rfft2 over all C_in channels, channel sum in the frequency
+    # domain, one inverse transform. Transform size is the full linear
+    # convolution (H+4, W+4) so nothing wraps around.
+    shape = (H + 4, W + 4)
+    src3 = src_flat.reshape(H+2, W+2, C_in).astype(np.float64)
+    wt3  = wt_flat.reshape(3, 3, C_in)[::-1, ::-1, :].astype(np.float64)
+    S  = np.fft.rfft2(src3, s=shape, axes=(0, 1))
+    Wf = np.fft.rfft2(wt3,  s=shape, axes=(0, 1))
+    full = np.fft.irfft2((S * Wf).sum(axis=-1), s=shape)
+    acc = np.rint(full[2:2+H, 2:2+W]).astype(np.int32)
     return acc.astype(np.int16)
 
 ref = conv_numpy(src_np, wt_np, H, W, C_in)
 
 # --- correctness ---
 lib.conv2d_3x3_u8i8(src_c, wt_c, dst_c, H, W, C_in)
-dst_ea_arr = np.frombuffer(dst_c.raw, dtype=np.int16)
+assert dst_ea.any(), "kernel returned zeros"
 ref_flat = ref.flatten()
-if np.array_equal(dst_ea_arr, ref_flat):
+if np.array_equal(dst_ea, ref_flat):
     print("Correctness: PASS ✓")
 else:
-    diff = np.abs(dst_ea_arr.astype(np.int32) - ref_flat.astype(np.int32))
+    diff = np.abs(dst_ea.astype(np.int32) - ref_flat.astype(np.int32))
     print(f"Correctness: FAIL — max diff {diff.max()}, mismatches {(diff>0).sum()}/{H*W}")
-    print(f"  first few ea:  {dst_ea_arr[:8]}")
+    print(f"  first few ea:  {dst_ea[:8]}")
     print(f"  first few ref: {ref_flat[:8]}")
+for name, func in (("im2col sgemm ", conv_gemm),
+                   ("tiled sgemm  ", conv_gemm_tiled),
+                   ("FFT reference", conv_fft)):
+    ok = np.array_equal(func(src_np, wt_np, H, W, C_in), ref)
+    print(f"{name} : {'PASS ✓' if ok else 'FAIL'}")
+if signal is not None:
+    ok = np.array_equal(conv_scipy(src_np, wt_np, H, W, C_in), ref)
+    print(f"SciPy correlate : {'PASS ✓' if ok else 'FAIL'}")
+if numba is not None:
+    ok = np.array_equal(conv_numba(src_np, wt_np, H, W, C_in), ref)
+    print(f"Numba direct    : {'PASS ✓' if ok else 'FAIL'}")
 
 # --- benchmark ---
 WARMUP, RUNS = 5, 50
 
-for _ in range(WARMUP):
-    lib.conv2d_3x3_u8i8(src_c, wt_c, dst_c, H, W, C_in)
-ea_times = []
-for _ in range(RUNS):
-    t0 = time.perf_counter()
-    lib.conv2d_3x3_u8i8(src_c, wt_c, dst_c, H, W, C_in)
-    ea_times.append(time.perf_counter() - t0)
-
-for _ in range(WARMUP):
-    conv_numpy(src_np, wt_np, H, W, C_in)
-np_times = []
-for _ in range(RUNS):
-    t0 = time.perf_counter()
-    conv_numpy(src_np, wt_np, H, W, C_in)
-    np_times.append(time.perf_counter() - t0)
-
-ea_ms  = np.median(ea_times)  * 1000
-np_ms  = np.median(np_times)  * 1000
-ea_std = np.std(ea_times)     * 1000
-np_std = np.std(np_times)     * 1000
+def fastest_cpu():
+    # On hybrid parts (P-cores + E-cores) the P-cores report the highest
+    # cpuinfo_max_freq; elsewhere every CPU ties and the first one wins.
+    cpus = sorted(os.sched_getaffinity(0))
+    def max_freq(cpu):
+        path = f"/sys/devices/system/cpu/cpu{cpu}/cpufreq/cpuinfo_max_freq"
+        try:
+            with open(path) as f:
+                return int(f.read())
+        except (OSError, ValueError):
+            return 0
+    return max(cpus, key=max_freq)
+
+def bench(func, *args):
+    # Pin to one fast core and keep the GC out of the timed loop, so runs
+    # don't migrate between cores mid-measurement. Both are restored on exit.
+    with contextlib.ExitStack() as stack:
+        if hasattr(os, "sched_setaffinity"):
+            saved = os.sched_getaffinity(0)
+            os.sched_setaffinity(0, {fastest_cpu()})
+            stack.callback(os.sched_setaffinity, 0, saved)
+        if gc.isenabled():
+            gc.disable()
+            stack.callback(gc.enable)
+
+        for _ in range(WARMUP):
+            func(*args)
+        times = []
+        for _ in range(RUNS):
+            t0 = time.perf_counter()
+            func(*args)
+            times.append(time.perf_counter() - t0)
+    return np.median(times) * 1000, np.std(times) * 1000
+
+ea_ms,  ea_std  = bench(lib.conv2d_3x3_u8i8, src_c, wt_c, dst_c, H, W, C_in)
+np_ms,  np_std  = bench(conv_numpy, src_np, wt_np, H, W, C_in)
+mm_ms,  mm_std  = bench(conv_gemm, src_np, wt_np, H, W, C_in)
+mt_ms,  mt_std  = bench(conv_gemm_tiled, src_np, wt_np, H, W, C_in)
+fft_ms, fft_std = bench(conv_fft, src_np, wt_np, H, W, C_in)
+if signal is not None:
+    sp_ms, sp_std = bench(conv_scipy, src_np, wt_np, H, W, C_in)
+if numba is not None:
+    nb_ms, nb_std = bench(conv_numba, src_np, wt_np, H, W, C_in)
 
 print(f"\nEä  conv2d_3x3 ({H}×{W}×{C_in}): {ea_ms:.3f} ms ± {ea_std:.3f}")
 print(f"NumPy reference              : {np_ms:.3f} ms ± {np_std:.3f}")
-print(f"Speedup: {np_ms/ea_ms:.2f}x")
+print(f"NumPy im2col @ (BLAS sgemm)  : {mm_ms:.3f} ms ± {mm_std:.3f}")
+print(f"NumPy tiled im2col @ ({GEMM_TILE_ROWS} rows) : {mt_ms:.3f} ms ± {mt_std:.3f}")
+print(f"NumPy FFT (batched rfft2)    : {fft_ms:.3f} ms ± {fft_std:.3f}")
+if signal is not None:
+    print(f"SciPy signal.correlate (C)   : {sp_ms:.3f} ms ± {sp_std:.3f}")
+else:
+    print("SciPy signal.correlate (C)   : skipped (pip install scipy)")
+if numba is not None:
+    print(f"Numba njit (parallel)        : {nb_ms:.3f} ms ± {nb_std:.3f}")
+else:
+    print("Numba njit (parallel)        : skipped (pip install numba)")
+best_ms = min(mm_ms, mt_ms)
+print(f"Speedup: {np_ms/ea_ms:.2f}x  (vs BLAS: {best_ms/ea_ms:.2f}x, "
+      f"vs FFT: {fft_ms/ea_ms:.2f}x)")
 print(f"\nMACs: {H*W*9*C_in*2:,}")
 mac_per_s = (H*W*9*C_in*2) / ea_ms * 1e3
 print(f"Eä throughput: {mac_per_s/1e9:.2f} GMACs/s")
+
+# --- row tiles: one call per band of output rows, input band L1-resident ---
+# A band of `rows` outputs reads rows+2 padded input rows (the 3x3 halo), so
+# the band size is picked to keep that input plus the weights within ~24 KB
+# of a 32 KB L1d. Tiles are plain pointer offsets into the same buffers.
+L1_TILE_BYTES = 24 * 1024
+row_bytes = (W + 2) * C_in
+TILE_ROWS = max(1, (L1_TILE_BYTES - 9 * C_in) // row_bytes - 2)
+tile_args = [(src_c + h0 * row_bytes, wt_c, dst_c + h0 * W * dst_ea.itemsize,
+              min(TILE_ROWS, H - h0), W, C_in)
+             for h0 in range(0, H, TILE_ROWS)]
+
+def run_tiled(conv=lib.conv2d_3x3_u8i8, calls=tile_args):
+    for args in calls:
+        conv(*args)
+
+dst_ea.fill(0)
+run_tiled()
+tiled_ok = np.array_equal(dst_ea, ref_flat)
+ti_ms, ti_std = bench(run_tiled)
+print(f"\nRow-tiled Eä ({TILE_ROWS} rows/call, {len(tile_args)} calls): "
+      f"{'PASS ✓' if tiled_ok else 'FAIL'}")
+print(f"  whole image, 1 call : {ea_ms:.3f} ms ± {ea_std:.3f}")
+print(f"  row tiles           : {ti_ms:.3f} ms ± {ti_std:.3f}  ({ea_ms/ti_ms:.2f}x)")
+
+# --- size sweep: one call per size vs one batched call ---
+SIZES = [(14, 14), (28, 28), (56, 56), (112, 112)]
+
+sweep_rng = np.random.RandomState(7)
+sweep_src = [sweep_rng.randint(0, 128, ((h+2)*(w+2)*C_in,)).astype(np.uint8)
+             for h, w in SIZES]
+src_offs = np.cumsum([0] + [a.size for a in sweep_src])
+dst_offs = np.cumsum([0] + [h*w for h, w in SIZES])
+src_all = np.concatenate(sweep_src)
+dst_all = np.zeros(dst_offs[-1], dtype=np.int16)
+desc = np.array([[h, w, src_offs[i], dst_offs[i]] for i, (h, w) in enumerate(SIZES)],
+                dtype=np.int32)
+
+lib.conv2d_3x3_u8i8_batch(src_all.ctypes.data, wt_c, dst_all.ctypes.data,
+                          desc.ctypes.data, len(SIZES), C_in)
+batch_ok = all(
+    np.array_equal(dst_all[dst_offs[i]:dst_offs[i+1]],
+                   conv_numpy(sweep_src[i], wt_np, h, w, C_in).ravel())
+    for i, (h, w) in enumerate(SIZES)
+)
+print(f"\nSize sweep (C_in={C_in}), batched kernel: {'PASS ✓' if batch_ok else 'FAIL'}")
+
+def zeros_aligned(n, dtype, align=64):
+    # Over-allocate raw bytes and slice at the first `align`-byte boundary.
+    nbytes = n * np.dtype(dtype).itemsize
+    raw = np.zeros(nbytes + align, dtype=np.uint8)
+    off = -raw.ctypes.data % align
+    return raw[off:off + nbytes].view(dtype)
+
+# Per-size calls all write into one 64-byte-aligned slab sized for the largest
+# output, so no size gets its own allocation or cold output lines.
+max_out = max(h * w for h, w in SIZES)
+dst_slab = zeros_aligned(max_out, np.int16)
+dst_slab_c = dst_slab.ctypes.data
+sweep_args = [(src_all[src_offs[i]:].ctypes.data, wt_c, dst_slab_c, h, w, C_in)
+              for i, (h, w) in enumerate(SIZES)]
+for (h, w), args in zip(SIZES, sweep_args):
+    ms, std = bench(lib.conv2d_3x3_u8i8, *args)
+    print(f"  {h:>3}×{w:<3}: {ms:.3f} ms ± {std:.3f}")
+
+def run_separate(conv=lib.conv2d_3x3_u8i8, calls=sweep_args):
+    for args in calls:
+        conv(*args)
+
+sep_ms, sep_std = bench(run_separate)
+bat_ms, bat_std = bench(lib.conv2d_3x3_u8i8_batch, src_all.ctypes.data, wt_c,
+                        dst_all.ctypes.data, desc.ctypes.data, len(SIZES), C_in)
+print(f"  all sizes, {len(SIZES)} calls : {sep_ms:.3f} ms ± {sep_std:.3f}")
+print(f"  all sizes, 1 batch call: {bat_ms:.3f} ms ± {bat_std:.3f}")
+
+# --- VNNI: exact i32 accumulation, four dpbusd chains ---
+if C_in % 64 == 0:
+    # Full u8 x i8 range: this would overflow the i16 kernel, not this one.
+    wide_rng = np.random.RandomState(11)
+    src_wide = wide_rng.randint(0, 256, src_np.size).astype(np.uint8)
+    wt_wide  = wide_rng.randint(-128, 128, wt_np.size).astype(np.int8)
+    dst_vnni = np.zeros(H * W, dtype=np.int32)
+    lib.conv2d_3x3_u8i8_vnni(src_wide.ctypes.data, wt_wide.ctypes.data,
+                             dst_vnni.ctypes.data, H, W, C_in)
+    ref_wide = conv_numpy_i32(src_wide, wt_wide, H, W, C_in)
+    vnni_ok = np.array_equal(dst_vnni, ref_wide.ravel())
+    if numba is not None:
+        vnni_ok &= np.array_equal(conv_numba(src_wide, wt_wide, H, W, C_in, np.int32), ref_wide)
+    vn_ms, vn_std = bench(lib.conv2d_3x3_u8i8_vnni, src_c, wt_c,
+                          dst_vnni.ctypes.data, H, W, C_in)
+    print(f"\nVNNI conv2d_3x3 (dpbusd -> {dot_isa()}), full-range exact i32: "
+          f"{'PASS ✓' if vnni_ok else 'FAIL'}")
+    print(f"  maddubs i16 (2 chains) : {ea_ms:.3f} ms ± {ea_std:.3f}")
+    print(f"  dpbusd i32  (4 chains) : {vn_ms:.3f} ms ± {vn_std:.3f}  "
+          f"({ea_ms/vn_ms:.2f}x)")
@@ -5,7 +5,8 @@ Renders a classic Cornell Box scene: 5 walls (red left, green right,
 white floor/ceiling/back), 2 spheres (one diffuse, one mirror),
 direct lighting with hard shadows, single-bounce mirror reflection.
 
-The entire ray tracer runs as a single Eä kernel.
+The entire ray tracer runs as a single Eä kernel. Rows are independent, so
+the image is also rendered as strips of rows spread over a thread pool.
 
 Usage:
     python run.py [width] [height]
@@ -14,9 +15,13 @@ Usage:
 """
 
 import ctypes
+import functools
+import hashlib
+import os
 import subprocess
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import numpy as np
@@ -25,10 +30,32 @@ DEMO_DIR = Path(__file__).parent
 EA_ROOT = DEMO_DIR / ".." / ".."
 
 
+def _build_digest(ea_path):
+    """Cache key for the built .so: the .ea contents plus the compiler binary.
+
+    The binary is identified by size and mtime, so a rebuilt compiler (which
+    may lower the same source differently) invalidates the cached .so.
+    """
+    compiler = EA_ROOT / "target" / "release" / "ea"
+    stamp = b""
+    if compiler.exists():
+        st = compiler.stat()
+        stamp = f"{st.st_size}:{st.st_mtime_ns}".encode()
+    return hashlib.blake2b(ea_path.read_bytes() + stamp, digest_size=16).hexdigest()
+
+
 def compile_kernel():
     ea_path = DEMO_DIR / "cornell.ea"
     so_path = DEMO_DIR / "cornell.so"
 
+    # Reuse the last build while cornell.ea is unchanged and the
+    # compiler binary is the same (see _build_digest).
+    hash_path = so_path.with_suffix(".so.hash")
+    src_hash = _build_digest(ea_path)
+    if (so_path.exists() and hash_path.exists()
+            and hash_path.read_text() == src_hash):
+        return so_path
+
     print("Compiling cornell.ea ...")
     result = subprocess.run(
         ["cargo", "run", "--features=llvm", "--release", "--",
@@ -42,11 +69,59 @@ def compile_kernel():
     built = EA_ROOT / "cornell.so"
     if built.exists():
         built.rename(so_path)
+    # cargo run may just have rebuilt the compiler: key on the one used
+    hash_path.write_text(_build_digest(ea_path))
 
     print(f"  Built: {so_path}")
     return so_path
 
 
+STRIP_ROWS = 16  # rows per render_strip call; many strips per thread evens out load
+
+
+@functools.lru_cache(maxsize=None)
+def _render_pool():
+    """Worker threads for strips; ctypes releases the GIL around kernel calls."""
+    return ThreadPoolExecutor(max_workers=os.cpu_count())
+
+
+def render_parallel(lib, ptr, width, height):
+    """Render the image as STRIP_ROWS-row strips, in parallel on multi-core.
+
+    Strips write disjoint rows of the same buffer, so no locking is needed.
+    """
+    def run_strip(y0):
+        lib.render_strip(ptr, width, height, y0, min(y0 + STRIP_ROWS, height))
+
+    strips = range(0, height, STRIP_ROWS)
+    if (os.cpu_count() or 1) > 1 and len(strips) > 1:
+        list(_render_pool().map(run_strip, strips))  # re-raises worker errors
+    else:
+        for y0 in strips:
+            run_strip(y0)
+
+
+def tone_map_u8(buf):
+    """Linear [0, 1] radiance to 8-bit pixels with one float32 temporary.
+
+    Scale, clamp in place, then one cast; clamping after the scale gives the
+    same bytes as clip-then-scale.
+    """
+    scaled = np.multiply(buf, 255.0, dtype=np.float32)
+    np.clip(scaled, 0.0, 255.0, out=scaled)
+    return scaled.astype(np.uint8)
+
+
+def median_ms(render, n_runs):
+    times = []
+    for _ in range(n_runs):
+        t0 = time.perf_counter()
+        render()
+        t1 = time.perf_counter()
+        times.append((t1 - t0) * 1000)
+    return sorted(times)[n_runs // 2]
+
+
 def main():
     width = int(sys.argv[1]) if len(sys.argv) > 1 else 512
     height = int(sys.argv[2]) if len(sys.argv) > 2 else 512
@@ -60,6 +135,14 @@ def main():
         ctypes.c_int32,
     ]
     lib.render.restype = None
+    lib.render_strip.argtypes = [
+        ctypes.POINTER(ctypes.c_float),
+        ctypes.c_int32,
+        ctypes.c_int32,
+        ctypes.c_int32,
+        ctypes.c_int32,
+    ]
+    lib.render_strip.restype = None
 
     buf = np.zeros((height, width, 3), dtype=np.float32)
     ptr = buf.ctypes.data_as(ctypes.POINTER(ctypes.c_float))
@@ -67,21 +150,16 @@ def main():
     # Warmup
     print(f"\nRendering {width}x{height} ...")
     lib.render(ptr, width, height)
+    render_parallel(lib, ptr, width, height)
 
     # Benchmark
     n_runs = 10
-    times = []
-    for _ in range(n_runs):
-        t0 = time.perf_counter()
-        lib.render(ptr, width, height)
-        t1 = time.perf_counter()
-        times.append((t1 - t0) * 1000)
-
-    median = sorted(times)[n_runs // 2]
+    n_threads = os.cpu_count() or 1
+    single = median_ms(lambda: lib.render(ptr, width, height), n_runs)
+    median = median_ms(lambda: render_parallel(lib, ptr, width, height), n_runs)
 
     # Save image
-    img = np.clip(buf, 0.0, 1.0)
-    img = (img * 255).astype(np.uint8)
+    img = tone_map_u8(buf)
 
     out_path = DEMO_DIR / "output.png"
     try:
@@ -98,7 +176,9 @@ def main():
     print(f"\n=== Performance ===")
     print(f"  Resolution    : {width}x{height}")
     print(f"  Pixels        : {width * height:,}")
-    print(f"  Eä render     : {median:.1f} ms (median of {n_runs} runs)")
+    print(f"  Eä render     : {single:.1f} ms (1 thread, median of {n_runs} runs)")
+    print(f"  Eä strips     : {median:.1f} ms ({n_threads} threads, "
+          f"{STRIP_ROWS}-row strips, {single / median:.2f}x)")
     print(f"  Rays/sec      : {width * height / (median / 1000):,.0f}")
     print(f"  Features used : sqrt, rsqrt, to_f32, unary negation, struct return, recursion")
 
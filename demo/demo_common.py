@@ -0,0 +1,31 @@
+"""
+Shared helpers for the demos.
+
+Host capability probes that more than one demo reports on, kept here so
+the demos agree on what they print.
+"""
+
+import platform
+from pathlib import Path
+
+
+def dot_isa():
+    """Name the instruction the native build lowers dpbusd to on this host."""
+    try:
+        cpuinfo = Path("/proc/cpuinfo").read_text()
+    except OSError:
+        cpuinfo = ""
+    flags = set()
+    # x86 lists CPU features on "flags" lines, Arm on "Features" lines
+    for line in cpuinfo.splitlines():
+        key, _, value = line.partition(":")
+        if key.strip() in ("flags", "Features"):
+            flags.update(value.split())
+    if platform.machine().lower() in ("aarch64", "arm64"):
+        if "i8mm" in flags:
+            return "usdot (i8mm)"
+        if "asimddp" in flags:
+            return "udot (dotprod)"
+    elif "avx_vnni" in flags or {"avx512_vnni", "avx512vl"} <= flags:
+        return "vpdpbusd (VNNI)"
+    return "widened i32 multiply-add"
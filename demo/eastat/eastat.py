@@ -22,7 +22,6 @@ from pathlib import Path
 
 import numpy as np
 import csv_parse
-import csv_stats
 
 
 # ---------------------------------------------------------------------------
@@ -129,8 +128,11 @@ def process(filepath, delimiter=',', has_header=True, selected_columns=None):
     # Shared buffers (reused across columns)
     fs_buf = np.empty(data_rows, dtype=np.int32)
     fe_buf = np.empty(data_rows, dtype=np.int32)
-    val_buf = np.empty(data_rows, dtype=np.float32)
     cnt_buf = np.zeros(1, dtype=np.int32)
+    sum_buf = np.zeros(1, dtype=np.float64)
+    min_buf = np.zeros(1, dtype=np.float32)
+    max_buf = np.zeros(1, dtype=np.float32)
+    sumsq_buf = np.zeros(1, dtype=np.float64)
 
     for ci in cols:
         if ci >= col_count:
@@ -145,13 +147,15 @@ def process(filepath, delimiter=',', has_header=True, selected_columns=None):
             fs_buf, fe_buf
         )
 
-        # Try numeric parse
-        cnt_buf[0] = 0
-        csv_parse.batch_atof(text, fs_buf, fe_buf, val_buf, cnt_buf)
+        # Try numeric parse, reducing as it goes (no values array)
+        csv_parse.batch_atof_stats(text, fs_buf, fe_buf, cnt_buf,
+                                   sum_buf, min_buf, max_buf, sumsq_buf)
         count = int(cnt_buf[0])
 
         if count >= data_rows * 0.5:
-            stats = _numeric_stats(val_buf, count, data_rows)
+            stats = _numeric_stats(count, data_rows, float(sum_buf[0]),
+                                   float(min_buf[0]), float(max_buf[0]),
+                                   float(sumsq_buf[0]))
             # Detect integer vs float
             mn, mx = stats['min'], stats['max']
             if mn == int(mn) and mx == int(mx) and abs(mx) < 1e7:
@@ -178,34 +182,14 @@ def process(filepath, delimiter=',', has_header=True, selected_columns=None):
     return results, headers, data_rows, col_count, timings
 
 
-def _numeric_stats(val_buf, count, total_rows):
-    """Compute numeric column stats from parsed values."""
-    values = val_buf[:count]
+def _numeric_stats(count, total_rows, total_sum, total_min, total_max, total_sumsq):
+    """Compute numeric column stats from the fused parse + reduce totals."""
     nulls = total_rows - count
 
     if count == 0:
         return {'rows': total_rows, 'nulls': nulls, 'count': 0,
                 'min': None, 'max': None, 'mean': None, 'stddev': None, 'sum': None}
 
-    if count >= 16:
-        out_sum = np.zeros(1, dtype=np.float32)
-        out_min = np.zeros(1, dtype=np.float32)
-        out_max = np.zeros(1, dtype=np.float32)
-        out_sumsq = np.zeros(1, dtype=np.float32)
-
-        csv_stats.f32_column_stats(values, out_sum, out_min, out_max, out_sumsq)
-
-        total_sum = float(out_sum[0])
-        total_min = float(out_min[0])
-        total_max = float(out_max[0])
-        total_sumsq = float(out_sumsq[0])
-    else:
-        arr = values.astype(np.float64)
-        total_sum = float(np.sum(arr))
-        total_min = float(np.min(arr))
-        total_max = float(np.max(arr))
-        total_sumsq = float(np.sum(arr ** 2))
-
     mean = total_sum / count
     variance = max(0.0, total_sumsq / count - mean * mean)
     stddev = math.sqrt(variance)
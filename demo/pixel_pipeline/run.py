@@ -15,26 +15,49 @@ Usage:
 
 import sys
 import time
+import hashlib
 import ctypes
 import subprocess
+from itertools import repeat
 from pathlib import Path
 import numpy as np
 
 DEMO_DIR = Path(__file__).parent
 EA_ROOT = DEMO_DIR / ".." / ".."
 
-U8PTR  = ctypes.POINTER(ctypes.c_uint8)
-F32PTR = ctypes.POINTER(ctypes.c_float)
+# Pointer args are declared c_void_p and passed as raw addresses
+# (arr.ctypes.data), so a call skips the POINTER object data_as() builds.
+PTR = ctypes.c_void_p
 
 # ---------------------------------------------------------------------------
 # Build
 # ---------------------------------------------------------------------------
 
+def _build_digest(ea_path):
+    """Cache key for the built .so: the .ea contents plus the compiler binary.
+
+    The binary is identified by size and mtime, so a rebuilt compiler (which
+    may lower the same source differently) invalidates the cached .so.
+    """
+    compiler = EA_ROOT / "target" / "release" / "ea"
+    stamp = b""
+    if compiler.exists():
+        st = compiler.stat()
+        stamp = f"{st.st_size}:{st.st_mtime_ns}".encode()
+    return hashlib.blake2b(ea_path.read_bytes() + stamp, digest_size=16).hexdigest()
+
+
 def build_pipeline():
     so_path = DEMO_DIR / "pipeline.so"
     ea_path = DEMO_DIR / "pipeline.ea"
 
-    if so_path.exists() and so_path.stat().st_mtime > ea_path.stat().st_mtime:
+    # Key the cached .so on the source contents, not mtimes: a checkout that
+    # touches pipeline.ea without changing it does not force a rebuild, while a
+    # rebuilt compiler does (see _build_digest).
+    hash_path = so_path.with_suffix(".so.hash")
+    src_hash = _build_digest(ea_path)
+    if (so_path.exists() and hash_path.exists()
+            and hash_path.read_text() == src_hash):
         return so_path
 
     print("Building Eä kernel (pipeline)...")
@@ -50,6 +73,8 @@ def build_pipeline():
     built = EA_ROOT / "pipeline.so"
     if built.exists():
         built.rename(so_path)
+    # cargo run may just have rebuilt the compiler: key on the one used
+    hash_path.write_text(_build_digest(ea_path))
 
     print(f"  Built: {so_path}")
     return so_path
@@ -58,10 +83,10 @@ def build_pipeline():
 def load_lib(so_path):
     lib = ctypes.CDLL(str(so_path))
 
-    lib.threshold_u8x16.argtypes = [U8PTR, U8PTR, ctypes.c_int32, ctypes.c_uint8]
+    lib.threshold_u8x16.argtypes = [PTR, PTR, ctypes.c_int32, ctypes.c_uint8]
     lib.threshold_u8x16.restype  = None
 
-    lib.normalize_u8_f32x8.argtypes = [U8PTR, F32PTR, ctypes.c_int32]
+    lib.normalize_u8_f32x8.argtypes = [PTR, PTR, ctypes.c_int32]
     lib.normalize_u8_f32x8.restype  = None
 
     return lib
@@ -100,52 +125,97 @@ def pad_to_multiple(arr, k):
 THRESH = 128
 
 
-def threshold_numpy(img):
-    return np.where(img > THRESH, np.uint8(255), np.uint8(0))
+def threshold_numpy(img, out=None):
+    # Compare straight into the output bytes (bool 0/1), then negate in
+    # uint8 so 1 wraps to 255: one pass, no mask temporary, no promotion.
+    if out is None:
+        out = np.empty_like(img)
+    np.greater(img, THRESH, out=out.view(np.bool_))
+    np.negative(out, out=out)
+    return out
 
 
 def threshold_ea(lib, flat_src, n_orig):
     flat_dst = np.empty_like(flat_src)
     lib.threshold_u8x16(
-        flat_src.ctypes.data_as(U8PTR),
-        flat_dst.ctypes.data_as(U8PTR),
-        ctypes.c_int32(len(flat_src)),
-        ctypes.c_uint8(THRESH),
+        flat_src.ctypes.data, flat_dst.ctypes.data, len(flat_src), THRESH,
     )
     return flat_dst[:n_orig]
 
 
+def bind_threshold(lib, flat_src):
+    """Zero-arg threshold call for timing: function, dst and args bound once."""
+    flat_dst = np.empty_like(flat_src)
+
+    def call(_fn=lib.threshold_u8x16, _s=flat_src.ctypes.data,
+             _d=flat_dst.ctypes.data, _n=len(flat_src), _t=THRESH):
+        _fn(_s, _d, _n, _t)
+
+    call.dst = flat_dst  # keep the buffer alive as long as the call
+    return call
+
+
 # ---------------------------------------------------------------------------
 # Normalize
 # ---------------------------------------------------------------------------
 
-def normalize_numpy(img):
-    return img.astype(np.float32) / 255.0
+INV_255 = np.float32(1 / 255.0)
+
+
+def normalize_numpy(img, out=None):
+    # Cast and scale in one ufunc pass into a float32 buffer (the same
+    # multiply-by-reciprocal the kernel does), instead of astype + divide.
+    if out is None:
+        out = np.empty(img.shape, dtype=np.float32)
+    np.multiply(img, INV_255, out=out, casting="unsafe")
+    return out
 
 
 def normalize_ea(lib, flat_src, n_orig):
     dst = np.empty(len(flat_src), dtype=np.float32)
-    lib.normalize_u8_f32x8(
-        flat_src.ctypes.data_as(U8PTR),
-        dst.ctypes.data_as(F32PTR),
-        ctypes.c_int32(len(flat_src)),
-    )
+    lib.normalize_u8_f32x8(flat_src.ctypes.data, dst.ctypes.data, len(flat_src))
     return dst[:n_orig]
 
 
+def bind_normalize(lib, flat_src):
+    """Zero-arg normalize call for timing: function, dst and args bound once."""
+    dst = np.empty(len(flat_src), dtype=np.float32)
+
+    def call(_fn=lib.normalize_u8_f32x8, _s=flat_src.ctypes.data,
+             _d=dst.ctypes.data, _n=len(flat_src)):
+        _fn(_s, _d, _n)
+
+    call.dst = dst
+    return call
+
+
 # ---------------------------------------------------------------------------
 # Benchmark
 # ---------------------------------------------------------------------------
 
-def benchmark(func, *args, warmup=5, runs=50):
+def benchmark(func, *args, warmup=5, runs=50, min_batch_ns=1_000_000):
+    """Median and std of per-call time in ms.
+
+    Calls are timed in batches long enough (>= 1 ms) that clock-read
+    overhead is amortised for microsecond kernels, as timeit does.
+    """
     for _ in range(warmup):
         func(*args)
+    batch = 1
+    while True:
+        t0 = time.perf_counter_ns()
+        for _ in repeat(None, batch):
+            func(*args)
+        if time.perf_counter_ns() - t0 >= min_batch_ns:
+            break
+        batch *= 2
     times = []
     for _ in range(runs):
-        t0 = time.perf_counter()
-        func(*args)
-        t1 = time.perf_counter()
-        times.append((t1 - t0) * 1000)
+        t0 = time.perf_counter_ns()
+        for _ in repeat(None, batch):
+            func(*args)
+        t1 = time.perf_counter_ns()
+        times.append((t1 - t0) / batch / 1e6)
     times.sort()
     return times[len(times) // 2], float(np.std(times))
 
@@ -179,7 +249,7 @@ def main():
     print("=" * 62)
     print()
     print(f"  Eä: loads u8x16, compares .> splat({THRESH}), selects 0/255, stores u8x16")
-    print(f"  NumPy: np.where(img > {THRESH}, 255, 0)  [promotes to int32 internally]")
+    print(f"  NumPy: np.greater(img, {THRESH}, out=dst) + uint8 negate  [preallocated dst]")
     print()
 
     ref_thresh  = threshold_numpy(img).ravel()
@@ -189,8 +259,8 @@ def main():
     print(f"  Correctness: {'PASS — exact byte match' if match else 'FAIL'}")
     print()
 
-    t_np_t,  s_np_t  = benchmark(threshold_numpy, img)
-    t_ea_t,  s_ea_t  = benchmark(threshold_ea, lib, flat16, n16)
+    t_np_t,  s_np_t  = benchmark(threshold_numpy, img, np.empty_like(img))
+    t_ea_t,  s_ea_t  = benchmark(bind_threshold(lib, flat16))
 
     print(f"  NumPy   : {t_np_t:7.2f} ms  ±{s_np_t:.2f}")
     print(f"  Eä      : {t_ea_t:7.2f} ms  ±{s_ea_t:.2f}")
@@ -204,7 +274,7 @@ def main():
     print("=" * 62)
     print()
     print( "  Eä: widen_u8_f32x4 × 2 per 8-byte chunk, scale, store f32x4 × 2")
-    print( "  NumPy: img.astype(float32) / 255.0  [two-pass: cast then divide]")
+    print( "  NumPy: np.multiply(img, float32(1/255), out=f32 buffer)  [one pass]")
     print()
 
     ref_norm  = normalize_numpy(img).ravel()
@@ -216,8 +286,9 @@ def main():
           f"({'PASS' if close else 'FAIL — exceeds tolerance'})")
     print()
 
-    t_np_n,  s_np_n  = benchmark(normalize_numpy, img)
-    t_ea_n,  s_ea_n  = benchmark(normalize_ea, lib, flat8, n8)
+    t_np_n,  s_np_n  = benchmark(normalize_numpy, img,
+                                 np.empty(img.shape, dtype=np.float32))
+    t_ea_n,  s_ea_n  = benchmark(bind_normalize(lib, flat8))
 
     print(f"  NumPy   : {t_np_n:7.2f} ms  ±{s_np_n:.2f}")
     print(f"  Eä      : {t_ea_n:7.2f} ms  ±{s_ea_n:.2f}")
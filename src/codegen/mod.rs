@@ -7,6 +7,8 @@ mod simd;
 #[cfg(feature = "llvm")]
 mod simd_arithmetic;
 #[cfg(feature = "llvm")]
+mod simd_dot;
+#[cfg(feature = "llvm")]
 mod simd_math;
 #[cfg(feature = "llvm")]
 mod simd_memory;
@@ -52,6 +54,7 @@ pub struct CodeGenerator<'ctx> {
     pub(crate) struct_fields: HashMap<String, Vec<(String, u32, Type)>>,
     pub(crate) avx512: bool,
     pub(crate) is_arm: bool,
+    pub(crate) dot_isa: crate::target::DotIsa,
     pub(crate) constants: HashMap<String, (Type, Literal)>,
 }
 
@@ -89,6 +92,7 @@ impl<'ctx> CodeGenerator<'ctx> {
             struct_fields: HashMap::new(),
             avx512: opts.extra_features.contains("avx512"),
             is_arm: opts.is_arm(),
+            dot_isa: crate::target::dot_isa(opts),
             constants: HashMap::new(),
         }
     }
@@ -41,6 +41,7 @@ impl<'ctx> CodeGenerator<'ctx> {
                 | "narrow_f32x4_i8"
                 | "maddubs_i16"
                 | "maddubs_i32"
+                | "dpbusd"
                 | "to_f32"
                 | "to_f64"
                 | "to_i32"
@@ -88,6 +89,7 @@ impl<'ctx> CodeGenerator<'ctx> {
             "narrow_f32x4_i8" => self.compile_narrow_f32x4_i8(args, function),
             "maddubs_i16" => self.compile_maddubs_i16(args, function),
             "maddubs_i32" => self.compile_maddubs_i32(args, function),
+            "dpbusd" => self.compile_dpbusd(args, function),
             "to_f32" | "to_f64" | "to_i32" | "to_i64" => {
                 self.compile_conversion(name, args, function)
             }
@@ -0,0 +1,169 @@
+use inkwell::types::VectorType;
+use inkwell::values::{BasicValueEnum, FunctionValue, VectorValue};
+
+use crate::ast::Expr;
+use crate::error::CompileError;
+use crate::target::DotIsa;
+
+use super::CodeGenerator;
+
+impl<'ctx> CodeGenerator<'ctx> {
+    /// dpbusd(acc: i32x4, u8x16, i8x16) -> i32x4
+    /// Each i32 lane = acc[i] + sum of four u8 × i8 products, exact in i32 — no i16
+    /// intermediate, so unlike maddubs nothing saturates.
+    /// Maps to VNNI vpdpbusd (_mm_dpbusd_epi32) on x86 and to usdot/udot on Arm when
+    /// the target has them; otherwise widens and adds lane groups, which is exact on
+    /// every target.
+    pub(super) fn compile_dpbusd(
+        &mut self,
+        args: &[Expr],
+        function: FunctionValue<'ctx>,
+    ) -> crate::error::Result<BasicValueEnum<'ctx>> {
+        let acc = self.compile_expr(&args[0], function)?.into_vector_value(); // i32x4
+        let a = self.compile_expr(&args[1], function)?.into_vector_value(); // u8x16
+        let b = self.compile_expr(&args[2], function)?.into_vector_value(); // i8x16
+
+        let result = match self.dot_isa {
+            DotIsa::Vnni => self.build_vpdpbusd(acc, a, b)?,
+            DotIsa::ArmUsdot => {
+                self.build_neon_dot("llvm.aarch64.neon.usdot.v4i32.v16i8", acc, a, b)?
+            }
+            DotIsa::ArmUdot => self.build_udot_biased(acc, a, b)?,
+            DotIsa::Widened => self.build_dpbusd_widened(acc, a, b)?,
+        };
+        Ok(BasicValueEnum::VectorValue(result))
+    }
+
+    fn build_vpdpbusd(
+        &mut self,
+        acc: VectorValue<'ctx>,
+        a: VectorValue<'ctx>,
+        b: VectorValue<'ctx>,
+    ) -> crate::error::Result<VectorValue<'ctx>> {
+        // The intrinsic takes the byte vectors as <4 x i32>.
+        let i32x4_ty = self.context.i32_type().vec_type(4);
+        let fn_type = i32x4_ty.fn_type(&[i32x4_ty.into(), i32x4_ty.into(), i32x4_ty.into()], false);
+        let intrinsic = self
+            .module
+            .get_function("llvm.x86.avx512.vpdpbusd.128")
+            .unwrap_or_else(|| {
+                self.module
+                    .add_function("llvm.x86.avx512.vpdpbusd.128", fn_type, None)
+            });
+
+        let a32 = self
+            .builder
+            .build_bit_cast(a, i32x4_ty, "dpbusd_a")
+            .map_err(|e| CompileError::codegen_error(e.to_string()))?;
+        let b32 = self
+            .builder
+            .build_bit_cast(b, i32x4_ty, "dpbusd_b")
+            .map_err(|e| CompileError::codegen_error(e.to_string()))?;
+
+        let result = self
+            .builder
+            .build_call(intrinsic, &[acc.into(), a32.into(), b32.into()], "dpbusd")
+            .map_err(|e| CompileError::codegen_error(e.to_string()))?
+            .try_as_basic_value()
+            .left()
+            .ok_or_else(|| CompileError::codegen_error("vpdpbusd did not return a value"))?;
+
+        Ok(result.into_vector_value())
+    }
+
+    /// Arm sdot/udot/usdot: <4 x i32> acc, two <16 x i8> operands.
+    fn build_neon_dot(
+        &mut self,
+        name: &str,
+        acc: VectorValue<'ctx>,
+        a: VectorValue<'ctx>,
+        b: VectorValue<'ctx>,
+    ) -> crate::error::Result<VectorValue<'ctx>> {
+        let i32x4_ty = self.context.i32_type().vec_type(4);
+        let i8x16_ty = self.context.i8_type().vec_type(16);
+        let fn_type = i32x4_ty.fn_type(&[i32x4_ty.into(), i8x16_ty.into(), i8x16_ty.into()], false);
+        let intrinsic = self
+            .module
+            .get_function(name)
+            .unwrap_or_else(|| self.module.add_function(name, fn_type, None));
+
+        let result = self
+            .builder
+            .build_call(intrinsic, &[acc.into(), a.into(), b.into()], "neon_dot")
+            .map_err(|e| CompileError::codegen_error(e.to_string()))?
+            .try_as_basic_value()
+            .left()
+            .ok_or_else(|| CompileError::codegen_error(format!("{name} did not return a value")))?;
+
+        Ok(result.into_vector_value())
+    }
+
+    /// FEAT_DotProd has no mixed-sign form, so bias the weights into u8:
+    /// a·b = udot(a, b ^ 0x80) - 128·Σa, with Σa itself a udot against ones.
+    fn build_udot_biased(
+        &mut self,
+        acc: VectorValue<'ctx>,
+        a: VectorValue<'ctx>,
+        b: VectorValue<'ctx>,
+    ) -> crate::error::Result<VectorValue<'ctx>> {
+        const UDOT: &str = "llvm.aarch64.neon.udot.v4i32.v16i8";
+        let i8_ty = self.context.i8_type();
+        let i32_ty = self.context.i32_type();
+        let splat8 = |v: u64| VectorType::const_vector(&[i8_ty.const_int(v, false); 16]);
+
+        let b_biased = self
+            .builder
+            .build_xor(b, splat8(0x80), "udot_bias")
+            .map_err(|e| CompileError::codegen_error(e.to_string()))?;
+        let dot = self.build_neon_dot(UDOT, acc, a, b_biased)?;
+        let sum_a = self.build_neon_dot(UDOT, i32_ty.vec_type(4).const_zero(), a, splat8(1))?;
+        let seven = VectorType::const_vector(&[i32_ty.const_int(7, false); 4]);
+        let correction = self
+            .builder
+            .build_left_shift(sum_a, seven, "udot_corr")
+            .map_err(|e| CompileError::codegen_error(e.to_string()))?;
+        self.builder
+            .build_int_sub(dot, correction, "udot_sub")
+            .map_err(|e| CompileError::codegen_error(e.to_string()))
+    }
+
+    /// Portable lowering: zext/sext to i32x16, multiply, then add the four
+    /// strided lane groups {k, 4+k, 8+k, 12+k} onto the accumulator.
+    fn build_dpbusd_widened(
+        &mut self,
+        acc: VectorValue<'ctx>,
+        a: VectorValue<'ctx>,
+        b: VectorValue<'ctx>,
+    ) -> crate::error::Result<VectorValue<'ctx>> {
+        let i32x16_ty = self.context.i32_type().vec_type(16);
+        let wa = self
+            .builder
+            .build_int_z_extend(a, i32x16_ty, "dpbusd_zext")
+            .map_err(|e| CompileError::codegen_error(e.to_string()))?;
+        let wb = self
+            .builder
+            .build_int_s_extend(b, i32x16_ty, "dpbusd_sext")
+            .map_err(|e| CompileError::codegen_error(e.to_string()))?;
+        let prod = self
+            .builder
+            .build_int_mul(wa, wb, "dpbusd_mul")
+            .map_err(|e| CompileError::codegen_error(e.to_string()))?;
+
+        let mut sum = acc;
+        for k in 0u64..4 {
+            let mask_vals: Vec<_> = (0u64..4)
+                .map(|i| self.context.i32_type().const_int(4 * i + k, false))
+                .collect();
+            let mask = VectorType::const_vector(&mask_vals);
+            let group = self
+                .builder
+                .build_shuffle_vector(prod, prod, mask, "dpbusd_group")
+                .map_err(|e| CompileError::codegen_error(e.to_string()))?;
+            sum = self
+                .builder
+                .build_int_add(sum, group, "dpbusd_add")
+                .map_err(|e| CompileError::codegen_error(e.to_string()))?;
+        }
+        Ok(sum)
+    }
+}
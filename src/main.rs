@@ -5,6 +5,18 @@ fn print_error(e: &CompileError, filename: &str, source: &str) {
     eprintln!("{}", format_with_source(e, filename, source));
 }
 
+#[cfg(feature = "llvm")]
+fn warn_unknown_target_cpu(opts: &ea_compiler::CompileOptions) {
+    if let Some(cpu) = &opts.target_cpu {
+        if ea_compiler::target::cpu_dot_features(cpu).is_none() {
+            eprintln!(
+                "warning: dot-product features of --target={cpu} are unknown; \
+                 dpbusd uses the widened lowering"
+            );
+        }
+    }
+}
+
 fn main() {
     let args: Vec<String> = std::env::args().skip(1).collect();
 
@@ -149,6 +161,7 @@ fn main() {
             eprintln!("error: --avx512 is incompatible with ARM target");
             process::exit(1);
         }
+        warn_unknown_target_cpu(&opts);
 
         let stem = std::path::Path::new(input_file)
             .file_stem()
@@ -338,6 +351,7 @@ fn handle_inspect(args: &[String]) {
             extra_features,
             target_triple,
         };
+        warn_unknown_target_cpu(&opts);
         match ea_compiler::inspect_source(&source, &opts) {
             Ok(report) => print!("{report}"),
             Err(e) => {
@@ -36,7 +36,10 @@ pub fn create_target_machine(opts: &CompileOptions) -> crate::error::Result<Targ
     let cross_compiling = opts.target_triple.is_some();
 
     let (cpu_str, base_features) = if let Some(ref cpu) = opts.target_cpu {
-        (cpu.clone(), String::new())
+        // Spelled out so the machine matches what `dot_isa` assumes even where
+        // this LLVM predates the CPU name.
+        let implied = cpu_dot_features(cpu).unwrap_or_default();
+        (cpu.clone(), implied.to_string())
     } else if cross_compiling {
         ("generic".to_string(), String::new())
     } else {
@@ -64,6 +67,91 @@ pub fn create_target_machine(opts: &CompileOptions) -> crate::error::Result<Targ
         .ok_or_else(|| CompileError::codegen_error("failed to create target machine"))
 }
 
+/// Instruction used to lower the `dpbusd` u8 × i8 dot-product intrinsic.
+#[cfg(feature = "llvm")]
+#[derive(Clone, Copy, Debug, PartialEq, Eq)]
+pub enum DotIsa {
+    /// x86 `vpdpbusd`: AVX-VNNI, or AVX512-VNNI with AVX512-VL.
+    Vnni,
+    /// Arm `usdot` (FEAT_I8MM): unsigned × signed in one instruction.
+    ArmUsdot,
+    /// Arm `udot` (FEAT_DotProd): unsigned only, signed weights are biased by +128.
+    ArmUdot,
+    /// No dot-product instruction: exact widen-multiply-add sequence.
+    Widened,
+}
+
+/// Dot-product features implied by a named `--target` CPU, in LLVM feature
+/// syntax. LLVM enables these on the target machine from the CPU name alone,
+/// but does not expose them through its C API, so they are listed here.
+/// `None` means the CPU is not in the table and `dpbusd` falls back to the
+/// widened lowering unless the features are requested explicitly.
+#[cfg(feature = "llvm")]
+pub fn cpu_dot_features(cpu: &str) -> Option<&'static str> {
+    match cpu {
+        // AVX512-VNNI with AVX512-VL
+        "cascadelake" | "cooperlake" | "icelake-client" | "icelake-server" | "tigerlake"
+        | "rocketlake" | "znver4" | "znver5" => Some("+avx512vnni,+avx512vl"),
+        // AVX-VNNI and AVX512-VNNI
+        "sapphirerapids" | "emeraldrapids" | "graniterapids" | "graniterapids-d" => {
+            Some("+avxvnni,+avx512vnni,+avx512vl")
+        }
+        // AVX-VNNI without AVX-512
+        "alderlake" | "raptorlake" | "meteorlake" | "gracemont" | "arrowlake" | "arrowlake-s"
+        | "lunarlake" | "pantherlake" | "sierraforest" | "grandridge" | "clearwaterforest" => {
+            Some("+avxvnni")
+        }
+        // FEAT_DotProd and FEAT_I8MM
+        "neoverse-n2" | "neoverse-n3" | "neoverse-v1" | "neoverse-v2" | "neoverse-v3"
+        | "neoverse-512tvb" | "cortex-a510" | "cortex-a520" | "cortex-a710" | "cortex-a715"
+        | "cortex-a720" | "cortex-x2" | "cortex-x3" | "cortex-x4" | "apple-a15" | "apple-a16"
+        | "apple-a17" | "apple-m2" | "apple-m3" | "apple-m4" | "ampere1" | "ampere1a" => {
+            Some("+dotprod,+i8mm")
+        }
+        // FEAT_DotProd only
+        "neoverse-n1" | "neoverse-e1" | "cortex-a55" | "cortex-a65" | "cortex-a75"
+        | "cortex-a76" | "cortex-a77" | "cortex-a78" | "cortex-a78c" | "cortex-x1"
+        | "cortex-x1c" | "apple-a13" | "apple-a14" | "apple-m1" => Some("+dotprod"),
+        // Known to have no dot-product instruction
+        "generic" | "x86-64" | "x86-64-v2" | "x86-64-v3" | "x86-64-v4" | "haswell"
+        | "broadwell" | "skylake" | "skylake-avx512" | "znver1" | "znver2" | "znver3"
+        | "cortex-a53" | "cortex-a57" | "cortex-a72" | "cortex-a73" => Some(""),
+        _ => None,
+    }
+}
+
+/// Pick the `dpbusd` lowering for the compile target. Native builds consult the
+/// host CPU features; a named CPU contributes the features it implies (see
+/// `cpu_dot_features`); explicitly requested features always count.
+#[cfg(feature = "llvm")]
+pub fn dot_isa(opts: &CompileOptions) -> DotIsa {
+    let native = opts.target_triple.is_none() && opts.target_cpu.is_none();
+    let mut features = opts.extra_features.clone();
+    if native {
+        features.push(',');
+        features.push_str(&TargetMachine::get_host_cpu_features().to_string());
+    } else if let Some(implied) = opts.target_cpu.as_deref().and_then(cpu_dot_features) {
+        features.push(',');
+        features.push_str(implied);
+    }
+    let has = |f: &str| features.split(',').any(|x| x.trim() == f);
+
+    let arm = opts.is_arm() || (opts.target_triple.is_none() && cfg!(target_arch = "aarch64"));
+    if arm {
+        if has("+i8mm") {
+            DotIsa::ArmUsdot
+        } else if has("+dotprod") {
+            DotIsa::ArmUdot
+        } else {
+            DotIsa::Widened
+        }
+    } else if has("+avxvnni") || (has("+avx512vnni") && has("+avx512vl")) {
+        DotIsa::Vnni
+    } else {
+        DotIsa::Widened
+    }
+}
+
 #[cfg(feature = "llvm")]
 pub fn write_object_file(
     module: &Module,
@@ -38,6 +38,7 @@ impl TypeChecker {
             "narrow_f32x4_i8" => Some(self.check_narrow_f32x4_i8(args, locals, span)),
             "maddubs_i16" => Some(self.check_maddubs_i16(args, locals, span)),
             "maddubs_i32" => Some(self.check_maddubs_i32(args, locals, span)),
+            "dpbusd" => Some(self.check_dpbusd(args, locals, span)),
             "prefetch" => Some(self.check_prefetch(args, locals, span)),
             "gather" => Some(self.check_gather(args, locals, span)),
             "scatter" => Some(self.check_scatter(args, locals, span)),
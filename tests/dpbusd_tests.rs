@@ -0,0 +1,165 @@
+#[cfg(feature = "llvm")]
+mod common;
+
+#[cfg(feature = "llvm")]
+mod tests {
+    use super::common::*;
+    use ea_compiler::{CompileOptions, OutputMode};
+    use tempfile::TempDir;
+
+    const DOT_KERNEL: &str = r#"
+        export func dot_u8i8(act: *u8, wt: *i8, n: i32) -> i32 {
+            let mut acc: i32x4 = splat(0)
+            let mut i: i32 = 0
+            while i < n {
+                let a: u8x16 = load(act, i)
+                let b: i8x16 = load(wt, i)
+                acc = dpbusd(acc, a, b)
+                i = i + 16
+            }
+            return reduce_add(acc)
+        }
+    "#;
+
+    // === dpbusd: i32x4 += u8x16 × i8x16 in groups of four, exact ===
+
+    #[test]
+    fn test_dpbusd_basic_lanes() {
+        // Lane i = acc[i] + a[4i]*b[4i] + ... + a[4i+3]*b[4i+3]
+        // a = [1,2,3,4, ...], b = [1,1,1,1, 2,2,2,2, 3,3,3,3, 4,4,4,4]
+        // lane 0 = 100 + (1+2+3+4)*1 = 110, lane 3 = 100 + (13+14+15+16)*4 = 332
+        assert_output(
+            r#"
+            func main() {
+                let acc: i32x4 = [100, 100, 100, 100]i32x4
+                let a: u8x16 = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15, 16]u8x16
+                let b: i8x16 = [1, 1, 1, 1, 2, 2, 2, 2, 3, 3, 3, 3, 4, 4, 4, 4]i8x16
+                let c: i32x4 = dpbusd(acc, a, b)
+                let x: i32 = c[0]
+                println(x)
+                let y: i32 = c[3]
+                println(y)
+            }
+            "#,
+            "110\n332",
+        );
+    }
+
+    #[test]
+    fn test_dpbusd_no_i16_saturation() {
+        // act=255, wt=127: one pmaddubsw pair is 64,770 and saturates at 32,767.
+        // dpbusd has no i16 step: 64 * 255 * 127 = 2,072,640.
+        assert_c_interop(
+            DOT_KERNEL,
+            r#"
+            #include <stdio.h>
+            #include <stdint.h>
+            extern int32_t dot_u8i8(const uint8_t *act, const int8_t *wt, int n);
+            int main() {
+                uint8_t act[64];
+                int8_t  wt[64];
+                for (int i = 0; i < 64; i++) { act[i] = 255; wt[i] = 127; }
+                printf("%d\n", dot_u8i8(act, wt, 64));
+                for (int i = 0; i < 64; i++) { wt[i] = -128; }
+                printf("%d\n", dot_u8i8(act, wt, 64));
+                return 0;
+            }
+            "#,
+            "2072640\n-2088960",
+        );
+    }
+
+    #[test]
+    #[cfg(target_arch = "x86_64")]
+    fn test_dpbusd_emits_vpdpbusd_with_vnni() {
+        let dir = TempDir::new().unwrap();
+        let asm_path = dir.path().join("dot.s");
+        let opts = CompileOptions {
+            target_cpu: Some("x86-64-v3".to_string()),
+            extra_features: "+avxvnni".to_string(),
+            ..CompileOptions::default()
+        };
+        ea_compiler::compile_with_options(DOT_KERNEL, &asm_path, OutputMode::Asm, &opts)
+            .expect("compilation failed");
+        let asm = std::fs::read_to_string(&asm_path).unwrap();
+        assert!(asm.contains("vpdpbusd"), "expected vpdpbusd in:\n{asm}");
+    }
+
+    #[test]
+    #[cfg(target_arch = "x86_64")]
+    fn test_dpbusd_named_cpu_implies_vnni() {
+        // No explicit features: sapphirerapids alone implies AVX-VNNI.
+        let dir = TempDir::new().unwrap();
+        let asm_path = dir.path().join("dot.s");
+        let opts = CompileOptions {
+            target_cpu: Some("sapphirerapids".to_string()),
+            ..CompileOptions::default()
+        };
+        ea_compiler::compile_with_options(DOT_KERNEL, &asm_path, OutputMode::Asm, &opts)
+            .expect("compilation failed");
+        let asm = std::fs::read_to_string(&asm_path).unwrap();
+        assert!(asm.contains("vpdpbusd"), "expected vpdpbusd in:\n{asm}");
+    }
+
+    #[test]
+    fn test_dpbusd_named_arm_cpu_implies_i8mm() {
+        let dir = TempDir::new().unwrap();
+        let asm_path = dir.path().join("dot.s");
+        let opts = CompileOptions {
+            target_triple: Some("aarch64-unknown-linux-gnu".to_string()),
+            target_cpu: Some("neoverse-n2".to_string()),
+            ..CompileOptions::default()
+        };
+        ea_compiler::compile_with_options(DOT_KERNEL, &asm_path, OutputMode::Asm, &opts)
+            .expect("compilation failed");
+        let asm = std::fs::read_to_string(&asm_path).unwrap();
+        assert!(asm.contains("usdot"), "expected usdot in:\n{asm}");
+    }
+
+    fn arm_asm(extra_features: &str) -> String {
+        let dir = TempDir::new().unwrap();
+        let asm_path = dir.path().join("dot.s");
+        let opts = CompileOptions {
+            target_triple: Some("aarch64-unknown-linux-gnu".to_string()),
+            extra_features: extra_features.to_string(),
+            ..CompileOptions::default()
+        };
+        ea_compiler::compile_with_options(DOT_KERNEL, &asm_path, OutputMode::Asm, &opts)
+            .expect("compilation failed");
+        std::fs::read_to_string(&asm_path).unwrap()
+    }
+
+    #[test]
+    fn test_dpbusd_emits_usdot_with_i8mm() {
+        let asm = arm_asm("+neon,+dotprod,+i8mm");
+        assert!(asm.contains("usdot"), "expected usdot in:\n{asm}");
+    }
+
+    #[test]
+    fn test_dpbusd_emits_udot_with_dotprod() {
+        let asm = arm_asm("+neon,+dotprod");
+        assert!(asm.contains("udot"), "expected udot in:\n{asm}");
+        assert!(!asm.contains("usdot"), "usdot needs i8mm:\n{asm}");
+    }
+
+    #[test]
+    fn test_dpbusd_arm_baseline_widens() {
+        let asm = arm_asm("+neon");
+        assert!(!asm.contains("udot"), "udot needs dotprod:\n{asm}");
+    }
+
+    #[test]
+    fn test_dpbusd_rejects_wrong_types() {
+        let tokens = ea_compiler::tokenize(
+            r#"
+            export func f(acc: i32x4, a: i8x16, b: i8x16) -> i32x4 {
+                return dpbusd(acc, a, b)
+            }
+            "#,
+        )
+        .unwrap();
+        let stmts = ea_compiler::parse(tokens).unwrap();
+        let msg = format!("{}", ea_compiler::check_types(&stmts).unwrap_err());
+        assert!(msg.contains("u8x16"), "expected u8x16 hint, got: {msg}");
+    }
+}